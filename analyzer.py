@@ -2,7 +2,10 @@
 Use this module to import the Analyze_Players_Data class.
 
 Please be sure that the following libraries installed in the python Source folder:
-abc, sklearn, pandas, numpy, os, matplotlib, seaborn, IPython
+abc, sklearn, scipy, joblib, pandas, numpy, pathlib, matplotlib, seaborn, IPython
+
+Optionally, install compiledtrees to speed up the predictions of the random forest models,
+and numba to compile the ranking of the predictions.
 """
 
 __author__ = "Felipe P A Fraga (fisfraga)"
@@ -11,16 +14,140 @@ __email__ = "lipefraga@gmail.com"
 from abc import ABC, abstractmethod
 import pandas as pd
 import numpy as np
-import os
+from pathlib import Path
 import seaborn as sns
 from IPython.display import display
+from scipy.stats import rankdata
+from joblib import Parallel, delayed, cpu_count
 
-from sklearn import svm
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.tree import DecisionTreeRegressor
-from sklearn.neighbors import KNeighborsRegressor
 from sklearn import linear_model
-from sklearn.linear_model import ElasticNetCV, MultiTaskElasticNetCV
+
+try:
+    import compiledtrees
+except ImportError:
+    compiledtrees = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def fit_model_and_predict(model, X, y, X_test):
+    """Fits one model to the training set and predicts the test set.
+    Random forests are compiled with compiledtrees before predicting, when it is installed.
+
+    Parameters
+    ----------
+    model : sklearn.base.BaseEstimator
+        the sci-kit learn model that will fit the data
+    X : numpy.ndarray
+        the stats used to fit the model
+    y : numpy.ndarray
+        the points used to fit the model
+    X_test : numpy.ndarray
+        the stats used to predict the chosen year
+
+    Returns
+    --------
+    prediction : numpy.ndarray
+        the prediction made by the model
+    """
+    model.fit(X, y)
+    if compiledtrees is not None and isinstance(model, RandomForestRegressor):
+        return compiledtrees.CompiledRegressionPredictor(model).predict(X_test)
+    return model.predict(X_test)
+
+
+def rank_descending(values):
+    """Ranks the values from the largest to the smallest, tied values receive the average of their ranks.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        the values that will be ranked
+
+    Returns
+    --------
+    ranks : numpy.ndarray
+        the rank of each value, starting at 1
+    """
+    return rankdata(-values)
+
+
+def rank_predictions(preds, reality):
+    """Ranks the predictions made by each model and the actual points, and calculates the averages and the errors of the rankings.
+    Compiled with numba when it is installed.
+
+    Parameters
+    ----------
+    preds : numpy.ndarray
+        matrix with one row for each player and one column for the prediction made by each model
+    reality : numpy.ndarray
+        the actual points made by each player
+
+    Returns
+    --------
+    ranks : numpy.ndarray
+        the ranking of each player for each model
+    reality_rank : numpy.ndarray
+        the actual ranking of each player
+    average : numpy.ndarray
+        the average of the predictions for each player
+    average_rank : numpy.ndarray
+        the average of the rankings of each player
+    rank_of_average : numpy.ndarray
+        the ranking of the average of the predictions
+    errors : numpy.ndarray
+        the difference between the ranking of each model and the actual ranking
+    """
+    ranks = np.column_stack([rank_descending(preds[:, j]) for j in range(preds.shape[1])])
+    reality_rank = rank_descending(reality)
+    average = preds.mean(axis=1)
+    average_rank = ranks.mean(axis=1)
+    rank_of_average = rank_descending(average)
+    errors = ranks - reality_rank[:, np.newaxis]
+    return ranks, reality_rank, average, average_rank, rank_of_average, errors
+
+
+if njit is not None:
+    @njit(cache=True)
+    def rank_descending(values):
+        order = np.argsort(-values)
+        ranks = np.empty(values.shape[0])
+        i = 0
+        while i < values.shape[0]:
+            j = i
+            while j + 1 < values.shape[0] and values[order[j + 1]] == values[order[i]]:
+                j += 1
+            for k in range(i, j + 1):
+                ranks[order[k]] = (i + j) / 2.0 + 1.0
+            i = j + 1
+        return ranks
+
+    @njit(cache=True)
+    def rank_predictions(preds, reality):
+        n_players, n_models = preds.shape
+        ranks = np.empty((n_players, n_models))
+        for j in range(n_models):
+            ranks[:, j] = rank_descending(np.ascontiguousarray(preds[:, j]))
+        reality_rank = rank_descending(reality)
+
+        average = np.zeros(n_players)
+        average_rank = np.zeros(n_players)
+        errors = np.empty((n_players, n_models))
+        for i in range(n_players):
+            for j in range(n_models):
+                average[i] += preds[i, j]
+                average_rank[i] += ranks[i, j]
+                errors[i, j] = ranks[i, j] - reality_rank[i]
+            average[i] /= n_models
+            average_rank[i] /= n_models
+        rank_of_average = rank_descending(average)
+        return ranks, reality_rank, average, average_rank, rank_of_average, errors
+
 
 class Data_Analyzer(ABC):
     """
@@ -35,8 +162,10 @@ class Data_Analyzer(ABC):
         the list of the stats which are considered for the Fantasy League
     valid_input : bool
         variable to indicate the presence of organized data
-    save_dir : str
-        path to the directory where the visualizations will be saved to
+    league_name : str
+        the Yahoo Fantasy league's name, used as prefix for the saved files
+    save_dir : pathlib.Path
+        path to the directory where the analysis will be saved to
 
     Methods:
     ----------
@@ -65,7 +194,8 @@ class Data_Analyzer(ABC):
             print("Input not recognised, please be sure to initialize this Class with an OrganizedData object")
             self.valid_input = False
         else:
-            self.save_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Analyzer_Output\\", organized_data.league_name)
+            self.league_name = organized_data.league_name
+            self.save_dir = Path(__file__).resolve().parent / "Analyzer_Output"
             self.valid_input = True
             print("This class supports the following functionalities:")
 
@@ -94,7 +224,7 @@ class Analyze_Players_Data(Data_Analyzer):
     Attributes
     ----------
     player_info : dict
-        dictionary with the descriptive information of the players, name, team, position
+        dictionary with a pandas DataFrame for each season, with the descriptive information of the players, name, position, team, and one row for each player
     avg_dfs : dict
         dictionary with pandas DataFrames containing the average stats for each player in the season
     X_dfs : dict
@@ -107,6 +237,8 @@ class Analyze_Players_Data(Data_Analyzer):
         dictionary with pandas DataFrames containing the stats that will input the model, considering advanced stats
     model_names : Array
         list with the names of the models used to fit the data and predict the outcome
+    model_templates : Array
+        list with the unfitted sci-kit learn models, cloned for each analysis
     predictions_3 : pandas.core.frame.DataFrame
         predictions made by the model considering the last 3 years of performance
     ranking_3 : pandas.core.frame.DataFrame
@@ -119,8 +251,16 @@ class Analyze_Players_Data(Data_Analyzer):
         predictions made by the model considering the last year of performance
     ranking_1 : pandas.core.frame.DataFrame
         rankings created by the model considering the last year of performance
-    final_predictions : pandas.core.frame.DataFrame
+    final_predictions : pandas.io.formats.style.Styler
         final predictions made by the model and the actual results
+    cmap : matplotlib.colors.Colormap
+        the color map used to display the predictions
+    feature_columns : Array
+        the columns of the season stats that are used as features by the models
+    training_data : dict
+        cache with the training and test sets already built for each (window, year) pair
+    parallel : joblib.Parallel
+        the threads that fit the models, shared by the analysis of every window while generate_all_analysis runs
     
 
     Methods
@@ -133,6 +273,14 @@ class Analyze_Players_Data(Data_Analyzer):
         generates the predictions for the chosen year, using data from the last 2 years in the  sci-kit learn models
     generate_analysis_1_year(models_template, year):
         generates the predictions for the chosen year, using data from the last year in the  sci-kit learn models
+    build_training_data(window, year):
+        builds (or reads from the cache) the training and test sets for a window of previous years
+    merge_seasons(season, window):
+        merges the stats of consecutive seasons, side by side, for each player
+    season_features(season):
+        returns the stats of a season that are used as features by the models
+    fit_and_predict(models, X, y, X_test):
+        fits each model to the training set and predicts the test set
     analyse_predictions(pred, ranking, y_real, drop_list):
         creates a DataFrame for the rankings of each prediction, calculates averages and errors
     """
@@ -152,6 +300,14 @@ class Analyze_Players_Data(Data_Analyzer):
 
             self.avg_dfs_advanced = data.avg_dfs_advanced
             self.X_dfs_advanced = data.X_dfs_advanced
+
+            self.feature_columns = list(data.X_columns)
+            self.training_data = {}
+            self.parallel = None
+
+            self.cmap = sns.diverging_palette(220, 20, as_cmap=True)
+            self.model_names = ["forest", "lasso", "elastic", "ridge"]
+            self.model_templates = [RandomForestRegressor(n_jobs=-1, random_state=0), linear_model.Lasso(alpha=0.1, precompute=True), linear_model.HuberRegressor(), linear_model.Ridge(alpha=.5, solver="cholesky")]
             print("Generate all the predictions for a given year: use .generate_all_analysis(year)")
 
 
@@ -167,20 +323,15 @@ class Analyze_Players_Data(Data_Analyzer):
         ----------
         None
         """
-        self.model_names = ["forest", "lasso", "elastic", "ridge"]
-        forest = RandomForestRegressor()
-        lasso = linear_model.Lasso(alpha=0.1)
-        elastic = linear_model.HuberRegressor()
-        #MultiTaskElasticNetCV(cv=5, random_state=0)
-        ridge = linear_model.Ridge()
-
-        models_3 = [forest, lasso, elastic, ridge]
-        models_2 = [RandomForestRegressor(), linear_model.Lasso(alpha=0.1), linear_model.HuberRegressor(), linear_model.Ridge(alpha=.5)]
-        models_1 = [RandomForestRegressor(), linear_model.Lasso(alpha=0.1), linear_model.HuberRegressor(), linear_model.Ridge(alpha=.5)]
+        ridge_3 = clone(self.model_templates[3]).set_params(alpha=1.0)
 
-        self.generate_analysis_3_years(models_3, year)
-        self.generate_analysis_2_years(models_2, year)
-        self.generate_analysis_1_year(models_1, year)
+        try:
+            with Parallel(n_jobs=len(self.model_names), backend='threading') as self.parallel:
+                self.generate_analysis_3_years(self.model_templates[:3] + [ridge_3], year)
+                self.generate_analysis_2_years(self.model_templates, year)
+                self.generate_analysis_1_year(self.model_templates, year)
+        finally:
+            self.parallel = None
 
 
     def generate_analysis_3_years(self, models_template, year):
@@ -189,8 +340,8 @@ class Analyze_Players_Data(Data_Analyzer):
 
         Parameters
         ----------
-        models_templates : Array
-            list with the object for each sci-kit learn model that will fit the data
+        models_template : Array
+            list with the unfitted sci-kit learn models, cloned before fitting the data
         year : int
             year that will be predicted by the model
 
@@ -199,57 +350,23 @@ class Analyze_Players_Data(Data_Analyzer):
         None
         """
         print("Generating analysis using 3 previous years data")
-        models = models_template.copy()
-        X_3_years = []
-        y_3_years = []
-        for season in list(self.X_dfs.keys()):
-            if season < year - 3:
-                temp = pd.merge(self.X_dfs[season].copy(), self.X_dfs[season+1].copy(), suffixes=('_3', '_2'), left_index=True, right_index=True)
-                X_3_years.append(pd.merge(temp, self.X_dfs[season+2].copy(), suffixes=('', '_1'), left_index=True, right_index=True))
-                y_3_years.append(self.y_dfs[season+3].copy())
-        
-        X_3 = pd.concat(X_3_years).reset_index(drop=True)
-        y_3 = pd.concat(y_3_years).reset_index(drop=True)
-        
-        drop_list = []
-        for index, row in X_3.iterrows():
-            if row['6_3'] == 0.0 or row['6_2'] == 0.0 or row[6] == 0.0:
-                drop_list.append(index)
-        X_3.drop(index=drop_list, inplace=True)
-        y_3.drop(index=drop_list, inplace=True)
-
-        temp = pd.merge(self.X_dfs[year-3].copy(), self.X_dfs[year-2].copy(), suffixes=('_3', '_2'), left_index=True, right_index=True)
-        X_3_test = pd.merge(temp, self.X_dfs[year-1].copy(), suffixes=('', '_1'), left_index=True, right_index=True)
-        y_3_real = self.y_dfs[year].copy()
-
-        test_drop_list = []
-        
-        for index, row in X_3_test.iterrows():
-            if row['6_3'] == 0.0 or row['6_2'] == 0.0 or row[6] == 0.0:
-                test_drop_list.append(index)
-        X_3_test.drop(index=test_drop_list, inplace=True)
-        y_3_real.drop(index=test_drop_list, inplace=True)
+        models = [clone(model) for model in models_template]
+        X_3, y_3, X_3_test, y_3_real, test_drop_list = self.build_training_data(3, year)
 
-        predictions = []
-        for model in models:
-            print(model)
-            model.fit(X_3, np.ravel(y_3))
-            pred = model.predict(X_3_test)
-            predictions.append(pred)
+        predictions = self.fit_and_predict(models, X_3, y_3, X_3_test)
 
-        self.predictions_3 = pd.DataFrame(predictions).transpose()
-        self.ranking_3 = pd.DataFrame.from_dict(self.player_info[2020], orient='index')
+        self.predictions_3 = pd.DataFrame(predictions, columns=self.model_names)
+        self.ranking_3 = self.player_info[2020].copy()
         
         self.analyse_predictions(self.predictions_3, self.ranking_3, y_3_real, test_drop_list)
 
-        self.final_predictions = self.ranking_3[['Player', 'Position', 'Team', 'Average Prediction', 'Reality', 'Avg_Rank_err']].copy().sort_values('Average Prediction')
-        self.final_predictions['Avg_Rank_err'] = self.final_predictions['Avg_Rank_err'].abs()
+        final_predictions = self.ranking_3[['Player', 'Position', 'Team', 'Average Prediction', 'Reality', 'Avg_Rank_err']].copy().sort_values('Average Prediction')
+        final_predictions['Avg_Rank_err'] = final_predictions['Avg_Rank_err'].abs()
         col_1_name = str(year) + "Predictions and Reality"
-        self.final_predictions['Player'].rename(col_1_name, inplace=True)
-        cm = sns.diverging_palette(220, 20, as_cmap=True)
-        self.final_predictions = self.final_predictions.style.background_gradient(cmap=cm).set_precision(0).hide_index()
+        final_predictions['Player'].rename(col_1_name, inplace=True)
+        self.final_predictions = final_predictions.style.background_gradient(cmap=self.cmap).set_precision(0).hide_index()
         display(self.final_predictions)
-        self.final_predictions.to_excel(self.save_dir + str(year) + "_predictions_using_last_3_years.xlsx")
+        self.final_predictions.to_excel(self.save_dir / f"{self.league_name}{year}_predictions_using_last_3_years.xlsx")
 
     def generate_analysis_2_years(self, models_template, year):
         """Generates the predictions for the chosen year, using sci-kit learn models.
@@ -257,8 +374,8 @@ class Analyze_Players_Data(Data_Analyzer):
 
         Parameters
         ----------
-        models_templates : Array
-            list with the object for each sci-kit learn model that will fit the data
+        models_template : Array
+            list with the unfitted sci-kit learn models, cloned before fitting the data
         year : int
             year that will be predicted by the model
 
@@ -267,53 +384,23 @@ class Analyze_Players_Data(Data_Analyzer):
         None
         """
         print("Generating analysis using 2 previous years data")
-        models = models_template.copy()
-        X_2_years = []
-        y_2_years = []
-        for season in list(self.X_dfs.keys()):
-            if season < year-2:
-                X_2_years.append(pd.merge(self.X_dfs[season].copy(), self.X_dfs[season+1].copy(), suffixes=('_2', '_1'), left_index=True, right_index=True))
-                y_2_years.append(self.y_dfs[season+2].copy())
-        
-        X_2 = pd.concat(X_2_years).reset_index(drop=True)
-        y_2 = pd.concat(y_2_years).reset_index(drop=True)
-        
-        drop_list = []
-        for index, row in X_2.iterrows():
-            if row['6_2'] == 0.0 or row['6_1'] == 0.0:
-                drop_list.append(index)
-        X_2.drop(index=drop_list, inplace=True)
-        y_2.drop(index=drop_list, inplace=True)
-
-        X_2_test =  pd.merge(self.X_dfs[year-2].copy(), self.X_dfs[year-1].copy(), suffixes=('_2', '_1'), left_index=True, right_index=True)
-        y_2_real = self.y_dfs[year].copy()
-
-        test_drop_list = []
-        for index, row in X_2_test.iterrows():
-            if row['6_2'] == 0.0 or row['6_1'] == 0.0:
-                test_drop_list.append(index)
-        X_2_test.drop(index=test_drop_list, inplace=True)
-        y_2_real.drop(index=test_drop_list, inplace=True)
-
-        predictions = []
-        for model in models:
-            model.fit(X_2, np.ravel(y_2))
-            pred = model.predict(X_2_test)
-            predictions.append(pred)
+        models = [clone(model) for model in models_template]
+        X_2, y_2, X_2_test, y_2_real, test_drop_list = self.build_training_data(2, year)
+
+        predictions = self.fit_and_predict(models, X_2, y_2, X_2_test)
 
-        self.predictions_2 = pd.DataFrame(predictions).transpose()
-        self.ranking_2 = pd.DataFrame.from_dict(self.player_info[2020], orient='index')
+        self.predictions_2 = pd.DataFrame(predictions, columns=self.model_names)
+        self.ranking_2 = self.player_info[2020].copy()
         self.analyse_predictions(self.predictions_2, self.ranking_2, y_2_real, test_drop_list)
 
         final_predictions = self.ranking_2[['Player', 'Position', 'Team', 'Average Prediction', 'Reality', 'Avg_Rank_err']].copy().sort_values('Average Prediction')
         final_predictions['Avg_Rank_err'] = final_predictions['Avg_Rank_err'].abs()
         col_1_name = str(year) + "Predictions and Reality"
         final_predictions['Player'].rename(col_1_name, inplace=True)
-        cm = sns.diverging_palette(220, 20, as_cmap=True)
-        display_predictions = final_predictions.style.background_gradient(cmap=cm).set_precision(0).hide_index()
+        display_predictions = final_predictions.style.background_gradient(cmap=self.cmap).set_precision(0).hide_index()
         display(display_predictions)
 
-        display_predictions.to_excel(self.save_dir + str(year) + "_predictions_using_last_2_years.xlsx")
+        display_predictions.to_excel(self.save_dir / f"{self.league_name}{year}_predictions_using_last_2_years.xlsx")
 
     def generate_analysis_1_year(self, models_template, year):
         """Generates the predictions for the chosen year, using sci-kit learn models.
@@ -321,8 +408,8 @@ class Analyze_Players_Data(Data_Analyzer):
 
         Parameters
         ----------
-        models_templates : Array
-            list with the object for each sci-kit learn model that will fit the data
+        models_template : Array
+            list with the unfitted sci-kit learn models, cloned before fitting the data
         year : int
             year that will be predicted by the model
 
@@ -331,33 +418,13 @@ class Analyze_Players_Data(Data_Analyzer):
         None
         """
         print("Generating analysis using the previous year's data")
-        models = models_template.copy()
-        X_1 = pd.concat(list(self.X_dfs[season] for season in range(2012, year-1))).reset_index(drop=True)
-        y_1 = pd.concat(list(self.y_dfs[season] for season in range(2013, year))).reset_index(drop=True)
-        drop_list = []
-        for index, row in X_1.iterrows():
-            if row[6] == 0.0:
-                drop_list.append(index)
-        X_1.drop(index=drop_list, inplace=True)
-        y_1.drop(index=drop_list, inplace=True)
-        X_1_test = self.X_dfs[year-1].copy()
-        y_1_real = self.y_dfs[year].copy()
-
-        test_drop_list = []
-        for index, row in X_1_test.iterrows():
-            if row[6] == 0.0:
-                test_drop_list.append(index)
-        X_1_test.drop(index=test_drop_list, inplace=True)
-        y_1_real.drop(index=test_drop_list, inplace=True)
-
-        predictions = []
-        for model in models:
-            model.fit(X_1, np.ravel(y_1))
-            pred = model.predict(X_1_test)
-            predictions.append(pred)
-        
-        self.predictions_1 = pd.DataFrame(predictions).transpose()
-        self.ranking_1 = pd.DataFrame.from_dict(self.player_info[2020], orient='index')
+        models = [clone(model) for model in models_template]
+        X_1, y_1, X_1_test, y_1_real, test_drop_list = self.build_training_data(1, year)
+
+        predictions = self.fit_and_predict(models, X_1, y_1, X_1_test)
+
+        self.predictions_1 = pd.DataFrame(predictions, columns=self.model_names)
+        self.ranking_1 = self.player_info[2020].copy()
 
         self.analyse_predictions(self.predictions_1, self.ranking_1, y_1_real, test_drop_list)
 
@@ -365,11 +432,144 @@ class Analyze_Players_Data(Data_Analyzer):
         final_predictions['Avg_Rank_err'] = final_predictions['Avg_Rank_err'].abs()
         col_1_name = str(year) + "Predictions and Reality"
         final_predictions['Player'].rename(col_1_name, inplace=True)
-        cm = sns.diverging_palette(220, 20, as_cmap=True)
-        display_predictions = final_predictions.style.background_gradient(cmap=cm).set_precision(0).hide_index()
+        display_predictions = final_predictions.style.background_gradient(cmap=self.cmap).set_precision(0).hide_index()
         display(display_predictions)
 
-        display_predictions.to_excel(self.save_dir + str(year) + "_predictions_using_last_year.xlsx")
+        display_predictions.to_excel(self.save_dir / f"{self.league_name}{year}_predictions_using_last_year.xlsx")
+
+    def build_training_data(self, window, year):
+        """Builds the training and test sets for the chosen year, considering the data for the past seasons in the window.
+        Players without games played in any of the seasons in the window are left out.
+        The sets are cached, so repeated analysis for the same year do not merge the seasons again.
+
+        Parameters
+        ----------
+        window : int
+            number of previous years considered when predicting the next, 1, 2 or 3
+        year : int
+            year that will be predicted by the model
+
+        Returns
+        --------
+        X : pandas.core.frame.DataFrame
+            the stats used to fit the models
+        y : pandas.core.frame.DataFrame
+            the points made in the following season, used to fit the models
+        X_test : pandas.core.frame.DataFrame
+            the stats used to predict the chosen year
+        y_real : pandas.core.frame.DataFrame
+            the actual points made in the chosen year
+        test_drop_list : pandas.core.indexes.base.Index
+            player ids that are not compatible with the model
+        """
+        key = (window, year, id(self.X_dfs))
+        if key in self.training_data:
+            return self.training_data[key]
+
+        games_columns = {3: ['6_3', '6_2', 6], 2: ['6_2', '6_1'], 1: [6]}[window]
+
+        X_years = []
+        y_years = []
+        for season in list(self.X_dfs.keys()):
+            if season < year - window:
+                X_years.append(self.merge_seasons(season, window))
+                y_years.append(self.y_dfs[season+window])
+
+        X = pd.concat(X_years, ignore_index=True, copy=False)
+        y = pd.concat(y_years, ignore_index=True, copy=False)
+
+        keep = X[games_columns].ne(0.0).all(axis=1)
+        X = X[keep]
+        y = y[keep]
+
+        X_test = self.merge_seasons(year - window, window)
+
+        keep_test = X_test[games_columns].ne(0.0).all(axis=1)
+        test_drop_list = X_test.index[~keep_test]
+        X_test = X_test[keep_test]
+        y_real = self.y_dfs[year].drop(index=test_drop_list)
+
+        self.training_data[key] = (X, y, X_test, y_real, test_drop_list)
+        return self.training_data[key]
+
+    def merge_seasons(self, season, window):
+        """Merges the stats for consecutive seasons side by side, starting at the chosen season
+
+        Parameters
+        ----------
+        season : int
+            the first season of the window
+        window : int
+            number of consecutive seasons that will be merged, 1, 2 or 3
+
+        Returns
+        --------
+        merged : pandas.core.frame.DataFrame
+            the stats for each player in all the seasons of the window
+        """
+        if window == 3:
+            temp = pd.merge(self.season_features(season), self.season_features(season+1), suffixes=('_3', '_2'), left_index=True, right_index=True)
+            return pd.merge(temp, self.season_features(season+2), suffixes=('', '_1'), left_index=True, right_index=True)
+        elif window == 2:
+            return pd.merge(self.season_features(season), self.season_features(season+1), suffixes=('_2', '_1'), left_index=True, right_index=True)
+        return self.season_features(season)
+
+    def season_features(self, season):
+        """Returns the stats of a season that are used as features by the models, so no other column widens the merged windows.
+        The DataFrame is only sliced when it carries columns besides the features.
+
+        Parameters
+        ----------
+        season : int
+            the season of the stats
+
+        Returns
+        --------
+        features : pandas.core.frame.DataFrame
+            the feature columns of the season stats for each player
+        """
+        X_df = self.X_dfs[season]
+        if list(X_df.columns) == self.feature_columns:
+            return X_df
+        return X_df[self.feature_columns]
+
+    def fit_and_predict(self, models, X, y, X_test):
+        """Fits each model to the training set and predicts the test set.
+        The sets are converted to contiguous float32 arrays once, so sci-kit learn does not copy them again for every model.
+        The models are independent, so they are fitted in parallel threads, since sci-kit learn releases the GIL while fitting,
+        and the random forest only uses the cores that are left for it by the other models.
+
+        Parameters
+        ----------
+        models : Array
+            list with the object for each sci-kit learn model that will fit the data
+        X : pandas.core.frame.DataFrame
+            the stats used to fit the models
+        y : pandas.core.frame.DataFrame
+            the points used to fit the models
+        X_test : pandas.core.frame.DataFrame
+            the stats used to predict the chosen year
+
+        Returns
+        --------
+        predictions : numpy.ndarray
+            matrix with one row for each player and one column for the prediction made by each model
+        """
+        X = np.ascontiguousarray(X.values, dtype=np.float32)
+        y = np.ascontiguousarray(np.ravel(y.values), dtype=np.float32)
+        X_test = np.ascontiguousarray(X_test.values, dtype=np.float32)
+
+        forest_jobs = max(1, cpu_count() - len(models) + 1)
+        for model in models:
+            if isinstance(model, RandomForestRegressor):
+                model.set_params(n_jobs=forest_jobs)
+        parallel = self.parallel if self.parallel is not None else Parallel(n_jobs=len(models), backend='threading')
+        results = parallel(delayed(fit_model_and_predict)(model, X, y, X_test) for model in models)
+
+        predictions = np.empty((X_test.shape[0], len(models)), dtype=np.float32)
+        for i, prediction in enumerate(results):
+            predictions[:, i] = prediction
+        return predictions
 
     def analyse_predictions(self, pred, ranking, y_real, drop_list):
         """Creates a DataFrame for the rankings of each prediction, calculates averages and errors
@@ -393,18 +593,21 @@ class Analyze_Players_Data(Data_Analyzer):
         pred.columns = self.model_names
         names = [model + '_err' for model in self.model_names]
         ranking.drop(index=drop_list, inplace=True)
-        ranking["Reality"] = y_real.rank(ascending=False)
+        reality = np.ravel(y_real.reindex(ranking.index).values).astype(np.float64)
         pred.index = ranking.index
-        pred['Average'] = pred.mean(axis=1)
-        pred['Reality'] = y_real
-        for model in self.model_names:
-            ranking[model] = pred[model].rank(ascending=False)
-        ranking['Average Prediction'] = ranking.drop(columns=['Player', 'Position', 'Team', 'Reality']).mean(axis=1)
-        ranking['Ranking of Averages'] = pred['Average'].rank(ascending=False)
-        ranking['Avg_Rank_err'] = ranking['Average Prediction'].sub(ranking["Reality"])
-        ranking['Rank_of_Avg_err'] = ranking['Ranking of Averages'].sub(ranking["Reality"])
+        preds_arr = np.ascontiguousarray(pred[self.model_names].to_numpy(), dtype=np.float64)
+        ranks_arr, reality_rank, average, average_rank, rank_of_average, errors = rank_predictions(preds_arr, reality)
+        ranking["Reality"] = reality_rank
+        pred['Average'] = average
+        pred['Reality'] = reality
+        for i, model in enumerate(self.model_names):
+            ranking[model] = ranks_arr[:, i]
+        ranking['Average Prediction'] = average_rank
+        ranking['Ranking of Averages'] = rank_of_average
+        ranking['Avg_Rank_err'] = average_rank - reality_rank
+        ranking['Rank_of_Avg_err'] = rank_of_average - reality_rank
         for i in range(len(names)):
-            ranking[names[i]] = ranking[self.model_names[i]].sub(ranking["Reality"])
+            ranking[names[i]] = errors[:, i]
             error = ranking[names[i]].abs().sum()
             print(self.model_names[i], error)
         
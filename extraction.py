@@ -2,7 +2,11 @@
 Use this module to import the Extract_Week_Data class.
 
 Please be sure that the following libraries installed in the python Source folder:
-json, datetime, abc
+json, os, copy, datetime, functools, logging, abc, concurrent, threading, shelve, time, numpy
+
+Optionally, install orjson to speed up saving and loading the extracted data,
+and pyarrow to save the players stats as columnar .parquet tables instead of .npz column archives,
+and numba to compile the resolution of the weekly matchups.
 """
 
 __author__ = "Felipe P A Fraga (fisfraga)"
@@ -10,11 +14,71 @@ __email__ = "lipefraga@gmail.com"
 
 
 import json
+import os
+import copy
 import datetime
+import functools
+import logging
 from abc import ABC, abstractmethod
+import threading
+import shelve
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 from yfpy_models import Player
 from requests.exceptions import HTTPError
 
+logger = logging.getLogger(__name__)
+
+
+def resolve_week_outcomes(first_team_ids, second_team_ids, is_tied, winner_ids, outcomes):
+    """Fills in the result of both teams of every matchup in the week.
+    Compiled with numba when it is installed.
+
+    Parameters
+    ----------
+    first_team_ids : numpy.ndarray
+        the identifier number of the first team of each matchup
+    second_team_ids : numpy.ndarray
+        the identifier number of the second team of each matchup
+    is_tied : numpy.ndarray
+        1 if the matchup was a draw, 0 otherwise
+    winner_ids : numpy.ndarray
+        the identifier number of the winner of each matchup
+    outcomes : numpy.ndarray
+        array indexed by the team identifier numbers, filled in with 1 for a win, 0.5 for a draw or 0 for a loss
+
+    Returns
+    -------
+    None
+    """
+    for k in range(first_team_ids.shape[0]):
+        if is_tied[k]:
+            outcomes[first_team_ids[k]] = 0.5
+            outcomes[second_team_ids[k]] = 0.5
+        elif winner_ids[k] == first_team_ids[k]:
+            outcomes[first_team_ids[k]] = 1.0
+        else:
+            outcomes[second_team_ids[k]] = 1.0
+
+
+if njit is not None:
+    resolve_week_outcomes = njit(cache=True)(resolve_week_outcomes)
+
+
 class Extract_Data(ABC):
     """Abstract class for extraction classes. Used to extract data from the Yahoo Fantasy API.
     Should be initiated using the SetUp object created for the Fantasy League.
@@ -45,13 +109,37 @@ class Extract_Data(ABC):
         the path pointing to the directory where the data will be saved
     extracted_data : dict
         the attribute containing the extracted data which will be used futher on
+    max_workers : int
+        the maximum number of simultaneous queries to the Yahoo Fantasy API
+    query_semaphore : threading.BoundedSemaphore
+        semaphore that limits the simultaneous queries to max_workers
+    cache_dir : str
+        the path pointing to the file where the responses of the Yahoo Fantasy API are cached
+    cache_ttl : int
+        the number of seconds the responses for the current week or season are kept in the cache
+    cache_lock : threading.Lock
+        lock used to access the cache file from one thread at a time
+    checkpoint_every : int
+        the number of newly extracted items after which the extraction files are saved again
+    league_url : str
+        the Yahoo Fantasy API url for the league, used as the prefix of the league queries
+    team_url : str
+        the Yahoo Fantasy API url prefix for the league's teams, completed with the team identifier number
+    player_url : str
+        the Yahoo Fantasy API url prefix for the sport's players, completed with the player identifier number
 
     Methods
     -------
     __init__(setup):
         initializes a Extract_Data object
+    query(url, data_key_list):
+        queries the Yahoo Fantasy API, respecting the limit of simultaneous queries, or reads the response from the cache
+    is_in_progress(url):
+        sees if a query is for the current week or season, whose data can still change
     save_to_json(data_dir):
         saves the extracted data into a json file
+    load_json(data_dir):
+        loads the data saved in a json file
 
     """
 
@@ -83,9 +171,68 @@ class Extract_Data(ABC):
 
         self.data_dir = setup.data_output_dir + "extraction"
         self.extracted_data = {}
+        self.max_workers = 8
+        self.query_semaphore = threading.BoundedSemaphore(self.max_workers)
+        self.cache_dir = self.data_dir + "_http_cache"
+        self.cache_ttl = 3600
+        self.cache_lock = threading.Lock()
+        self.league_url = f"https://fantasysports.yahooapis.com/fantasy/v2/league/{self.league_key}"
+        self.team_url = f"https://fantasysports.yahooapis.com/fantasy/v2/team/{self.league_key}.t."
+        self.player_url = f"https://fantasysports.yahooapis.com/fantasy/v2/players;player_keys={self.game_code}.p."
+        self.checkpoint_every = 25
+
+    def query(self, url, data_key_list):
+        """Queries the Yahoo Fantasy API. Waits while there are already max_workers queries running, to respect the API's rate limits.
+        The responses are cached on disk by url: finished weeks and seasons are kept forever,
+        the current week and season are kept for cache_ttl seconds.
+
+        Parameters
+        ----------
+        url : str
+            web url for the desired Yahoo Fantasy data
+        data_key_list : Array
+            list of keys used to extract the specific data desired by the query
+
+        Returns
+        ----------
+        data : YahooFantasyObject
+            object containing the information requested by the query
+        """
+        key = url + "|" + ",".join(data_key_list)
+        with self.cache_lock:
+            with shelve.open(self.cache_dir) as cache:
+                cached = cache.get(key)
+        if cached is not None and (cached[0] is None or time.time() < cached[0]):
+            return cached[1]
+
+        with self.query_semaphore:
+            data = self.yahoo_query.query(url, data_key_list)
+
+        if data is not None:
+            expires = time.time() + self.cache_ttl if self.is_in_progress(url) else None
+            with self.cache_lock:
+                with shelve.open(self.cache_dir) as cache:
+                    cache[key] = (expires, data)
+        return data
+
+    def is_in_progress(self, url):
+        """Sees if a query is for the current week or season, whose data can still change.
+
+        Parameters
+        ----------
+        url : str
+            web url for the desired Yahoo Fantasy data
+
+        Returns
+        ----------
+        in_progress : bool
+            True if the query is for the current week or season
+        """
+        return url.endswith("week=" + str(self.current_week)) or url.endswith("season=" + str(self.season))
 
     def save_to_json(self, data_dir):
-        """Initializes the Extract_Data object using the informations held by the SetUp object.
+        """Saves the extracted data into a compact json file, using orjson when it is installed.
+        The data is written to a temporary file first, so an interrupted save never corrupts the previous file.
 
         Parameters
         ----------
@@ -96,10 +243,35 @@ class Extract_Data(ABC):
         ----------
         None
         """
-        with open(data_dir, 'w') as filehandle:
-            json.dump(self.extracted_data, filehandle)
+        temp_dir = data_dir + ".tmp"
+        if orjson is not None:
+            with open(temp_dir, 'wb') as filehandle:
+                filehandle.write(orjson.dumps(self.extracted_data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(temp_dir, 'w') as filehandle:
+                filehandle.write(json.dumps(self.extracted_data, separators=(',', ':')))
+        os.replace(temp_dir, data_dir)
         pass
 
+    def load_json(self, data_dir):
+        """Loads the data saved in a json file, reading it in one go and parsing it with orjson when it is installed.
+
+        Parameters
+        ----------
+        data_dir : str
+            the path to the json file
+
+        Returns
+        ----------
+        data : dict or list
+            the data saved in the file
+        """
+        if orjson is not None:
+            with open(data_dir, 'rb') as json_file:
+                return orjson.loads(json_file.read())
+        with open(data_dir) as json_file:
+            return json.load(json_file)
+
 
 class Extract_Week_Data(Extract_Data):
     """Subclass for extracting the data representing the results for the Fantasy League's weeks. Used to extract data from the Yahoo Fantasy API.
@@ -109,8 +281,17 @@ class Extract_Week_Data(Extract_Data):
     ----------
     data_dir_week : str
         the path pointing to the directory where the weekly data will be saved
+    data_dir_final_week : str
+        the path pointing to the file that records the current week of the extraction that saved the weekly data,
+        the saved weeks before it had already ended when they were saved
     week_has_begun : int
         a value of 1 or 0 used to differentiate if the week already has data, in order to avoid extracting empty data
+    team_names : dict
+        dictionary with the team identifier numbers as keys and the team names as values
+    team_managers : dict
+        dictionary with the team identifier numbers as keys and the managers' names as values
+    int_season : int
+        the season of the league as an integer
 
     Methods
     -------
@@ -118,8 +299,12 @@ class Extract_Week_Data(Extract_Data):
         initializes a Extract_Week_Data object and runs the data extraction
     extract_week_data_headone():
         main method, called during __init__(), extracts all the data categorized by weeks
-    get_win_for_week(team, week_results):
-        sees if a certain team has won its matchup in the week
+    today_weekday():
+        finds today's weekday once and reuses it for every Extract_Week_Data object
+    load_finalized_weeks(weeks):
+        loads the already saved weeks that have ended, so they are not queried again
+    build_week_result_table(week_results):
+        finds the result of every team in the week, scanning the scoreboard once
     get_league_scoreboard(chosen_week):
         extracts the scoreboard for the week, matchups and results
     get_team_stats_by_week(team_id, chosen_week="current"):
@@ -139,15 +324,20 @@ class Extract_Week_Data(Extract_Data):
         None
         """
         super().__init__(setup)
+        self.team_names = {team: str(self.teams[str(team)][0]) for team in range(1, int(self.num_teams) + 1)}
+        self.team_managers = {team: str(self.teams[str(team)][1]) for team in range(1, int(self.num_teams) + 1)}
+        self.int_season = int(self.season)
         if self.league_scoring_type == "headone":
             self.extract_week_data_headone()
         else:
-            print("League type not supported")
+            logger.warning("League type %s not supported", self.league_scoring_type)
         pass
 
     def extract_week_data_headone(self):
         """Extracts the raw data for every existing week in a Yahoo Fantasy League. Saves it as a .json file.
         Is called automatically when the Extract_Week_Data object is initialized.
+        The queries for all weeks and teams are sent in parallel, up to max_workers at a time.
+        Weeks that have ended and were already saved are loaded from the file instead of queried.
 
             Parameters
             ----------
@@ -159,55 +349,110 @@ class Extract_Week_Data(Extract_Data):
         """
 
         self.data_dir_week = self.data_dir + "_weekly_stats_" + str(self.season) + ".txt"
+        self.data_dir_final_week = self.data_dir + "_weekly_stats_" + str(self.season) + "_final_week.txt"
         weekly_stats = {}
         print("Extracting season " + str(self.season) + " data from week 1 to", self.current_week, "\n")
         self.week_has_begun = 1
-        if datetime.datetime.today().weekday() == 0:
+        if self.today_weekday() == 0:
             self.week_has_begun = 0
-        for week in range(1, self.current_week + self.week_has_begun):
-            print("Week: ", week, " ... Loading ... ")
-            week_results = self.get_league_scoreboard(week)
-            weekly_stats[str(week)] = [None]*self.num_teams
-            for team in range(1, int(self.num_teams + 1)):
-                team_stats = {}
-                present_team_stats = self.get_team_stats_by_week(team, week)
-                team_stats["Team"] = str(self.teams[str(team)][0])
-                team_stats["Manager"] = str(self.teams[str(team)][1])
-                for stat_id in range(1, self.stat_count + 1):
-                    team_stats[stat_id] = present_team_stats['team_stats']['stats'][stat_id - 1]['stat'].value
-                team_stats["GP"] = present_team_stats['team_remaining_games']['total']['completed_games']
-                team_stats["Win"] = self.get_win_for_week(team, week_results)
-                team_stats["Season"] = int(self.season)
-                team_stats["Week"] = int(week)
-                weekly_stats[str(week)][int(team-1)] = team_stats
-            print("\nLoaded!\n")
+        weeks = range(1, self.current_week + self.week_has_begun)
+        teams = range(1, int(self.num_teams + 1))
+        stat_ids = range(1, self.stat_count + 1)
+        finalized_weeks = self.load_finalized_weeks(weeks)
+        weeks_to_query = [week for week in weeks if str(week) not in finalized_weeks]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            scoreboards = {week: executor.submit(self.get_league_scoreboard, week) for week in weeks_to_query}
+            teams_stats = {(week, team): executor.submit(self.get_team_stats_by_week, team, week) for week in weeks_to_query for team in teams}
+            for week in weeks:
+                if str(week) in finalized_weeks:
+                    weekly_stats[str(week)] = finalized_weeks[str(week)]
+                    continue
+                week_results = self.build_week_result_table(scoreboards[week].result())
+                weekly_stats[str(week)] = [None]*self.num_teams
+                for team in teams:
+                    present_team_stats = teams_stats[(week, team)].result()
+                    stats_values = [stat['stat'].value for stat in present_team_stats['team_stats']['stats'][:self.stat_count]]
+                    completed_games = present_team_stats['team_remaining_games']['total']['completed_games']
+                    weekly_stats[str(week)][team - 1] = {
+                        "Team": self.team_names[team],
+                        "Manager": self.team_managers[team],
+                        **dict(zip(stat_ids, stats_values)),
+                        "GP": completed_games,
+                        "Win": week_results[team],
+                        "Season": self.int_season,
+                        "Week": week
+                    }
+                print("Week:", week, "loaded")
         self.extracted_data = weekly_stats
         self.save_to_json(self.data_dir_week)
+        with open(self.data_dir_final_week, 'w') as filehandle:
+            filehandle.write(json.dumps({"current_week": self.current_week}))
         print("Weekly stats saved to: ", self.data_dir_week)
         pass
 
-    def get_win_for_week(self, team, week_results):
-        """Sees if a team has won its matchup in the week.
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def today_weekday():
+        """Finds today's weekday, computing it only once per run since every Extract_Week_Data object needs the same value.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        weekday : int
+            today's weekday, 0 being Monday and 6 being Sunday
+        """
+        return datetime.date.today().weekday()
+
+    def load_finalized_weeks(self, weeks):
+        """Loads the weeks that have already ended and were saved by a previous extraction, since their results can no longer change.
+        The current week is saved as well, before it ends, so only the weeks before the current week of the extraction that saved them are loaded,
+        as recorded in data_dir_final_week. Without that record every week is queried again.
+
+        Parameters
+        ----------
+        weeks : range
+            the weeks being extracted
+
+        Returns
+        -------
+        finalized_weeks : dict
+            dictionary with the weeks that had ended when they were saved as keys and their saved stats as values
+        """
+        try:
+            saved_current_week = int(self.load_json(self.data_dir_final_week)["current_week"])
+            saved_weeks = self.load_json(self.data_dir_week)
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return {}
+        final_week = min(self.current_week, saved_current_week)
+        return {str(week): saved_weeks[str(week)] for week in weeks
+                if week < final_week and saved_weeks.get(str(week)) and all(saved_weeks[str(week)])}
+
+    def build_week_result_table(self, week_results):
+        """Finds the result of every team in the week, scanning the matchups in the scoreboard only once.
+        The matchups are loaded into arrays once and resolved together by resolve_week_outcomes.
+        Wins and losses are returned as the ints 1 and 0, so the saved weeks keep their format.
 
         Parameters
         ----------
-        team : int
-            team identifier number
         week_results : dict
             dictionary with the results for each team in the week
 
         Returns
         -------
-        win : int
-            1 if the team's result was a win, 0.5 if it was a draw, 0 if it was a loss
+        outcomes : list
+            list indexed by the team identifier numbers, with 1 for a win, 0.5 for a draw or 0 for a loss as values
         """
-        for matchup in week_results["scoreboard"].matchups:
-            if matchup["matchup"].teams[0]["team"].team_id == str(team) or matchup["matchup"].teams[1]["team"].team_id == str(team):
-                if matchup["matchup"].is_tied == 1:
-                    return 0.5
-                elif matchup["matchup"].winner_team_key.split(".")[-1] == str(team):
-                    return 1
-        return 0
+        matchups = [matchup["matchup"] for matchup in week_results["scoreboard"].matchups]
+        first_team_ids = np.array([int(matchup.teams[0]["team"].team_id) for matchup in matchups], dtype=np.int16)
+        second_team_ids = np.array([int(matchup.teams[1]["team"].team_id) for matchup in matchups], dtype=np.int16)
+        is_tied = np.array([matchup.is_tied == 1 for matchup in matchups], dtype=np.int8)
+        winner_ids = np.array([0 if matchup.is_tied == 1 else int(matchup.winner_team_key.rsplit(".", 1)[1]) for matchup in matchups], dtype=np.int16)
+        outcomes = np.zeros(int(self.num_teams) + 1, dtype=np.float64)
+        resolve_week_outcomes(first_team_ids, second_team_ids, is_tied, winner_ids, outcomes)
+        return [outcome if outcome == 0.5 else int(outcome) for outcome in outcomes.tolist()]
 
     def get_league_scoreboard(self, chosen_week):
         """extracts the scoreboard containing matchups and results for the week.
@@ -223,9 +468,7 @@ class Extract_Week_Data(Extract_Data):
             object containing the information for the scoreboard
 
         """
-        return self.yahoo_query.query(
-            "https://fantasysports.yahooapis.com/fantasy/v2/league/" + self.league_key + "/scoreboard;type=week;week=" +
-            str(chosen_week), ["league"])
+        return self.query(f"{self.league_url}/scoreboard;type=week;week={chosen_week}", ["league"])
 
     def get_team_stats_by_week(self, team_id, chosen_week="current"):
         """extracts the stats for a team in a certain week
@@ -242,10 +485,7 @@ class Extract_Week_Data(Extract_Data):
         stats : YahooFantasyObject
             object containing the information for the stats
         """
-        team_key = self.league_key + ".t." + str(team_id)
-        return self.yahoo_query.query(
-            "https://fantasysports.yahooapis.com/fantasy/v2/team/" + str(team_key) + "/stats;type=week;week=" +
-            str(chosen_week), ["team"])
+        return self.query(f"{self.team_url}{team_id}/stats;type=week;week={chosen_week}", ["team"])
 
 
 
@@ -259,6 +499,10 @@ class Extract_Players_Season_Data(Extract_Data):
         the path pointing to the directory with the file containing the players' ids that will be extracted
     relevant_players_ids : Array
         array with the ids for the players that will have their data extracted
+    relevant_players_ids_set : set
+        the same ids as relevant_players_ids, used to check if a player is already in the list
+    blocked_players_ids : frozenset
+        ids of players that are never added to the extraction list
     data_dir_player_teams : str
         a value of 1 or 0 used to differentiate if the week already has data, in order to avoid extracting empty data
     players_info : Array
@@ -271,6 +515,10 @@ class Extract_Players_Season_Data(Extract_Data):
         dictionary containing the data extracted for all players
     advanced_data : dict
         dictionaty containing advanced stats from the nba for all players, 2017 onwards only
+    dirty_count : int
+        the number of items extracted in the running extraction, used to save checkpoints
+    players_log_dir : str
+        the path pointing to the log file where each player of the running season extraction is appended as one json line
     
 
 
@@ -280,10 +528,22 @@ class Extract_Players_Season_Data(Extract_Data):
         initializes a Extract_Players_Season_Data object
     update_player_id_database():
         called to update the file with the ids of the players that will be extracted
+    save_players_ids():
+        saves the relevant players ids and their descriptive information
     extract_players_season_data(season):
         extracts the data for each player for the called season
-    convert_to_number(value_string):
-        converts a string with a '-' into a '0'
+    save_players_data(data_dir_players_data, data_dir_advanced_players_data):
+        saves the extracted players stats and advanced stats
+    replay_players_log():
+        adds the players saved in the log by an interrupted extraction back into the data
+    compact_players_log(data_dir_players_data, data_dir_advanced_players_data):
+        saves the complete players data files and removes the log
+    save_to_parquet(players_data, data_dir):
+        saves the players stats as a columnar table, with one float column per stat
+    save_to_npz(players_data, data_dir):
+        saves the players stats as compressed numpy columns, with one float32 array per stat
+    convert_to_numbers(value_strings):
+        converts a list of stat strings into floats at once, turning '-' into 0.0
     get_player_stats(player_id, season):
         extracts the season stats for a player
     get_team_roster_player_stats_by_week(team_id, chosen_week="current")
@@ -305,6 +565,7 @@ class Extract_Players_Season_Data(Extract_Data):
         """
         super().__init__(setup)
         self.data_dir_relevant_players = self.data_dir + "_relevant_player_ids.txt"
+        self.blocked_players_ids = frozenset(['4626', '3708', '4905'])
         print("Players extraction created for season", self.season)
         pass
 
@@ -327,43 +588,64 @@ class Extract_Players_Season_Data(Extract_Data):
         self.starting_point = 2017
 
         try:
-            with open(self.data_dir_relevant_players) as json_file:
-                self.relevant_players_ids = json.load(json_file)
+            self.relevant_players_ids = self.load_json(self.data_dir_relevant_players)
         except FileNotFoundError:
-            print("The Relevant Players list was not found, creating one now...")
+            logger.info("The Relevant Players list was not found, creating one now")
         try:
-            with open(self.data_dir_extraction_stopping_point) as json_file:
-                self.starting_point = json.load(json_file)
+            self.starting_point = self.load_json(self.data_dir_extraction_stopping_point)
         except FileNotFoundError:
             pass
         
         if int(self.season) > int(self.starting_point):
-            print("Updating Extraction and Relevant Players.")
-            for week in range(1, self.current_week + 1):
-                for team_id in range(1, self.num_teams + 1):
-                    team = self.get_team_roster_player_stats_by_week(team_id, week)
-                    for player in team:
-                        player_id = player["player"].player_id
-                        
-                        if player_id not in self.relevant_players_ids and player_id not in ['4626', '3708', '4905']:
-                            self.relevant_players_ids.append(player_id)
-                            self.players_info.append([self.season, player_id, player["player"].editorial_team_abbr, player["player"].display_position])
-                            self.extracted_data = self.relevant_players_ids
-                            self.save_to_json(self.data_dir_relevant_players)
-                            self.extracted_data = self.players_info
-                            self.save_to_json(self.data_dir_players_teams)
+            logger.info("Updating Extraction and Relevant Players")
+            self.relevant_players_ids_set = set(self.relevant_players_ids)
+            self.dirty_count = 0
+            try:
+                for week in range(1, self.current_week + 1):
+                    for team_id in range(1, self.num_teams + 1):
+                        team = self.get_team_roster_player_stats_by_week(team_id, week)
+                        for player in team:
+                            player_id = player["player"].player_id
+
+                            if player_id not in self.relevant_players_ids_set and player_id not in self.blocked_players_ids:
+                                self.relevant_players_ids_set.add(player_id)
+                                self.relevant_players_ids.append(player_id)
+                                self.players_info.append([self.season, player_id, player["player"].editorial_team_abbr, player["player"].display_position])
+                                self.dirty_count += 1
+                                if self.dirty_count % self.checkpoint_every == 0:
+                                    self.save_players_ids()
+            finally:
+                if self.dirty_count > 0:
+                    self.save_players_ids()
             self.extracted_data = int(self.season)
             self.save_to_json(self.data_dir_extraction_stopping_point)
 
-            print("Relevant Players updated for", self.season, "season:")
-            print(self.relevant_players_ids)
+            print("Relevant Players updated for", self.season, "season")
+            logger.debug("Relevant Players ids: %s", self.relevant_players_ids)
 
         print("Total players for extraction = ", len(self.relevant_players_ids))
+
+    def save_players_ids(self):
+        """Saves the relevant players ids and the players descriptive information into their .json files.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.extracted_data = self.relevant_players_ids
+        self.save_to_json(self.data_dir_relevant_players)
+        self.extracted_data = self.players_info
+        self.save_to_json(self.data_dir_players_teams)
         
 
     def extract_players_season_data(self, season):
         """Extracts the season stats for all players in the extraction list. 
         Is called automatically by the Extract_NBA_Players_Data class.
+        The queries for the missing players are sent in parallel, up to max_workers at a time, and their results are saved in order.
 
         Parameters
         ----------
@@ -377,70 +659,213 @@ class Extract_Players_Season_Data(Extract_Data):
 
         data_dir_players_data = self.data_dir + "_players_dict_" + str(season) +".txt"
         data_dir_advanced_players_data = self.data_dir + "_players_dict_advanced_" + str(season) +".txt"
+        self.players_log_dir = data_dir_players_data + ".log"
 
         try:
-            with open(self.data_dir_relevant_players) as json_file:
-                self.relevant_players_ids = json.load(json_file)
+            self.relevant_players_ids = self.load_json(self.data_dir_relevant_players)
         except FileNotFoundError:
-            print("Relevante players list not found, please try again.")
+            logger.warning("Relevant players list not found, please try again")
         try:
-            with open(data_dir_players_data) as json_file:
-                self.data = json.load(json_file)
-            with open(data_dir_advanced_players_data) as json_file:
-                self.advanced_data = json.load(json_file)
+            self.data = self.load_json(data_dir_players_data)
+            self.advanced_data = self.load_json(data_dir_advanced_players_data)
         except FileNotFoundError:
-            print("This season has no extraction yet. Creating one now.")
+            logger.info("Season %s has no extraction yet, creating one now", season)
             self.data = {}
             self.advanced_data = {}
-        print("Extracting players data for:")
-        print("Season:", season)
-        print("Extraction ids:", self.relevant_players_ids)
-        print("Ids already extracted:", list(self.data.keys()))
-        for idd in self.relevant_players_ids:
-            if idd not in list(self.data.keys()):
-                player_stats = []
-                player_object = self.get_player_stats(idd, season)
-                
-                self.sample_player = player_object
-                player_stats.append(season)
-                player_stats.append(idd)
-                player_stats.append(player_object['name'].full)
-                player_stats.append(player_object['editorial_team_full_name'])
-                player_stats.append(player_object['editorial_team_abbr'])
-                player_stats.append(player_object['display_position'])
-                for stat in player_object['player_stats'].stats:
-                    player_stats.append(self.convert_to_number(stat['stat'].value))
-                self.data[idd]=player_stats
-                advanced_stats = player_stats.copy()
-                for advanced_stat in player_object['player_advanced_stats']['stats']:
-                        advanced_stats.append(self.convert_to_number(advanced_stat['stat'].value))
-                self.advanced_data[idd]=advanced_stats
-                
-                self.extracted_data = self.data
-                self.save_to_json(data_dir_players_data)
-                
-                self.extracted_data = self.advanced_data
-                self.save_to_json(data_dir_advanced_players_data)
-        print("Done")
-        
-
-    def convert_to_number(self, value_string):
-        """Converts a stat from a string into a float, and any string with an empty stat '-' into a number, '0.0'
+        replayed_count = self.replay_players_log()
+        already_extracted = set(self.data)
+        missing_ids = [idd for idd in self.relevant_players_ids if idd not in already_extracted]
+        if not missing_ids:
+            if replayed_count > 0:
+                self.compact_players_log(data_dir_players_data, data_dir_advanced_players_data)
+            print("Season", season, "is already extracted for all", len(self.relevant_players_ids), "players")
+            return
+        print("Extracting players data for season", season)
+        logger.debug("%d ids to extract, %d ids already extracted", len(missing_ids), len(already_extracted))
+        self.dirty_count = 0
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            players_objects = executor.map(self.get_player_stats, missing_ids, [season] * len(missing_ids))
+            with open(self.players_log_dir, 'a', buffering=1) as players_log:
+                for idd, player_object in zip(missing_ids, players_objects):
+                    self.sample_player = player_object
+                    player_info = [
+                        season,
+                        idd,
+                        player_object['name'].full,
+                        player_object['editorial_team_full_name'],
+                        player_object['editorial_team_abbr'],
+                        player_object['display_position']
+                    ]
+                    stats_values = [stat['stat'].value for stat in player_object['player_stats'].stats]
+                    advanced_values = [advanced_stat['stat'].value for advanced_stat in player_object['player_advanced_stats']['stats']]
+                    advanced_stats = player_info + self.convert_to_numbers(stats_values + advanced_values)
+                    self.data[idd]=advanced_stats[:len(player_info) + len(stats_values)]
+                    self.advanced_data[idd]=advanced_stats
+
+                    log_entry = {"id": idd, "stats": advanced_stats, "stats_count": len(player_info) + len(stats_values)}
+                    players_log.write((orjson.dumps(log_entry).decode() if orjson is not None else json.dumps(log_entry)) + "\n")
+                    self.dirty_count += 1
+        finally:
+            executor.shutdown(cancel_futures=True)
+            if self.dirty_count + replayed_count > 0:
+                self.compact_players_log(data_dir_players_data, data_dir_advanced_players_data)
+        print("Season", season, "done")
+
+    def save_players_data(self, data_dir_players_data, data_dir_advanced_players_data):
+        """Saves the extracted players stats and advanced stats into their .json files.
+        Both are also saved column by column, sharing the player_id column, so they can be read without parsing:
+        as .parquet tables when pyarrow is installed, or as .npz numpy archives otherwise.
 
         Parameters
         ----------
-        value_string : str
-            the string containing the number for a stat
+        data_dir_players_data : str
+            the path to the file where the players stats will be saved to
+        data_dir_advanced_players_data : str
+            the path to the file where the players advanced stats will be saved to
 
         Returns
         -------
-        value_string : float
-            float number corresponding to a stat value
+        None
         """
-        if value_string == '-':
-            return 0.0
+        self.extracted_data = self.data
+        self.save_to_json(data_dir_players_data)
+
+        self.extracted_data = self.advanced_data
+        self.save_to_json(data_dir_advanced_players_data)
+
+        if pa is not None:
+            self.save_to_parquet(self.data, data_dir_players_data)
+            self.save_to_parquet(self.advanced_data, data_dir_advanced_players_data)
         else:
-            return float(value_string)
+            self.save_to_npz(self.data, data_dir_players_data)
+            self.save_to_npz(self.advanced_data, data_dir_advanced_players_data)
+
+    def replay_players_log(self):
+        """Adds the players saved in the log by an interrupted extraction back into the data and advanced data.
+        Each line of the log holds one player's advanced stats and the number of them that are part of the regular stats.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        replayed_count : int
+            the number of players read from the log
+        """
+        replayed_count = 0
+        try:
+            with open(self.players_log_dir) as players_log:
+                for line in players_log:
+                    try:
+                        log_entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # the last line of an interrupted extraction may be incomplete
+                        break
+                    self.data[str(log_entry["id"])] = log_entry["stats"][:log_entry["stats_count"]]
+                    self.advanced_data[str(log_entry["id"])] = log_entry["stats"]
+                    replayed_count += 1
+        except FileNotFoundError:
+            pass
+        return replayed_count
+
+    def compact_players_log(self, data_dir_players_data, data_dir_advanced_players_data):
+        """Saves the complete players data files and removes the log, whose players are now in the files.
+
+        Parameters
+        ----------
+        data_dir_players_data : str
+            the path to the file where the players stats will be saved to
+        data_dir_advanced_players_data : str
+            the path to the file where the players advanced stats will be saved to
+
+        Returns
+        -------
+        None
+        """
+        self.save_players_data(data_dir_players_data, data_dir_advanced_players_data)
+        if os.path.exists(self.players_log_dir):
+            os.remove(self.players_log_dir)
+
+    def save_to_parquet(self, players_data, data_dir):
+        """Saves the players stats into a .parquet file next to their .json file, with a fixed schema:
+        season, player_id, name, team, team_abbr and position, followed by one float32 column per stat.
+
+        Parameters
+        ----------
+        players_data : dict
+            dictionary with the player ids as keys and the list of the player's info and stats as values
+        data_dir : str
+            the path to the .json file of the players stats, the .parquet file is saved with the same name
+
+        Returns
+        -------
+        None
+        """
+        if not players_data:
+            return
+        columns = list(zip(*players_data.values()))
+        info_columns = {
+            "season": pa.array([int(value) for value in columns[0]], type=pa.int16()),
+            "player_id": pa.array([int(value) for value in columns[1]], type=pa.int32()),
+            "name": pa.array(columns[2], type=pa.string()),
+            "team": pa.array(columns[3], type=pa.string()),
+            "team_abbr": pa.array(columns[4], type=pa.string()),
+            "position": pa.array(columns[5], type=pa.string()),
+        }
+        stat_columns = {"stat_" + str(i): pa.array(column, type=pa.float32()) for i, column in enumerate(columns[6:])}
+        temp_dir = os.path.splitext(data_dir)[0] + ".parquet.tmp"
+        pq.write_table(pa.table({**info_columns, **stat_columns}), temp_dir)
+        os.replace(temp_dir, os.path.splitext(data_dir)[0] + ".parquet")
+
+    def save_to_npz(self, players_data, data_dir):
+        """Saves the players stats into a compressed .npz file next to their .json file, with the same columns as save_to_parquet:
+        season, player_id, name, team, team_abbr and position, followed by one float32 array per stat.
+
+        Parameters
+        ----------
+        players_data : dict
+            dictionary with the player ids as keys and the list of the player's info and stats as values
+        data_dir : str
+            the path to the .json file of the players stats, the .npz file is saved with the same name
+
+        Returns
+        -------
+        None
+        """
+        if not players_data:
+            return
+        columns = list(zip(*players_data.values()))
+        info_columns = {
+            "season": np.asarray(columns[0], dtype=np.int16),
+            "player_id": np.asarray(columns[1], dtype=np.int32),
+            "name": np.asarray(columns[2], dtype=str),
+            "team": np.asarray(columns[3], dtype=str),
+            "team_abbr": np.asarray(columns[4], dtype=str),
+            "position": np.asarray(columns[5], dtype=str),
+        }
+        stat_columns = {"stat_" + str(i): np.asarray(column, dtype=np.float32) for i, column in enumerate(columns[6:])}
+        temp_dir = os.path.splitext(data_dir)[0] + ".npz.tmp"
+        with open(temp_dir, 'wb') as filehandle:
+            np.savez_compressed(filehandle, **info_columns, **stat_columns)
+        os.replace(temp_dir, os.path.splitext(data_dir)[0] + ".npz")
+
+    def convert_to_numbers(self, value_strings):
+        """Converts a list of stats from strings into floats in a single numpy pass, turning any empty stat '-' into 0.0
+
+        Parameters
+        ----------
+        value_strings : list
+            list of strings containing the numbers for the stats
+
+        Returns
+        -------
+        values : list
+            list of float numbers corresponding to the stat values
+        """
+        values = np.asarray(value_strings, dtype=str)
+        return np.where(values == '-', '0.0', values).astype(np.float64).tolist()
 
     def get_player_stats(self, player_id, season):
         """Retrieves the stats of a specific player by player_key and season.
@@ -456,10 +881,7 @@ class Extract_Players_Season_Data(Extract_Data):
         -------
         Yahoo Fantasy Object
         """
-        player_key = self.game_code + ".p." + str(player_id)
-        return self.yahoo_query.query(
-            "https://fantasysports.yahooapis.com/fantasy/v2/players;player_keys=" +
-            str(player_key) + "/stats;type=season;season=" + str(season), ["players", "0", "player"])
+        return self.query(f"{self.player_url}{player_id}/stats;type=season;season={season}", ["players", "0", "player"])
 
     def get_team_roster_player_stats_by_week(self, team_id, chosen_week="current"):
         """Retrieve roster with ALL player info for the season of specific team by team_id and for chosen league.
@@ -476,11 +898,7 @@ class Extract_Players_Season_Data(Extract_Data):
         roster : YahooFantasyObject
             object containing the information for the team roster data
         """
-        team_key = self.league_key + ".t." + str(team_id)
-        return self.yahoo_query.query(
-            "https://fantasysports.yahooapis.com/fantasy/v2/team/" + str(team_key) +
-            "/roster/players/stats;type=week;week=" + str(chosen_week),
-            ["team", "roster", "0", "players"])
+        return self.query(f"{self.team_url}{team_id}/roster/players/stats;type=week;week={chosen_week}", ["team", "roster", "0", "players"])
 
 
 
@@ -501,6 +919,8 @@ class Extract_NBA_Players_Data():
         attribute that extracts and saves the relevant players id
     players20 : Extract_Players_Season_Data
         attribute that extracts and saves the data for every player
+    season_workers : int
+        the number of seasons extracted at the same time
 
     Methods
     -------
@@ -510,6 +930,8 @@ class Extract_NBA_Players_Data():
         called to update the file with the ids of the players that will be extracted
     extract_all_seasons_data(season):
         extracts the data for each player for each season
+    extract_season_data(season):
+        extracts the data for each player for one season, using its own copy of the players20 extractor
     """
 
     def __init__(self, setup20, setup19=0, setup18=0):
@@ -533,6 +955,7 @@ class Extract_NBA_Players_Data():
             self.players18 = Extract_Players_Season_Data(setup18)
             self.players19 = Extract_Players_Season_Data(setup19)
         self.players20 = Extract_Players_Season_Data(setup20)
+        self.season_workers = 4
         pass
 
     def update_player_id_database(self):
@@ -552,12 +975,14 @@ class Extract_NBA_Players_Data():
             self.players18.update_player_id_database()
             self.players19.update_player_id_database()
         else:
-            print("Update is not possible for the seasons of 2019 and 2018, only for 2020")
+            logger.warning("Update is not possible for the seasons of 2019 and 2018, only for 2020")
         self.players20.update_player_id_database()
 
     def extract_all_seasons_data(self):
         """Extracts the season stats for all players in the extraction list. 
         Is calls a method in the Extract_Players_Season_Data object.
+        The seasons are independent, so up to season_workers of them are extracted at the same time,
+        while the queries of all seasons share the limit of simultaneous queries of players20.
 
         Parameters
         ----------
@@ -566,5 +991,20 @@ class Extract_NBA_Players_Data():
         -------
         None
         """
-        for season in range(2012, 2021):
-            self.players20.extract_players_season_data(season)
+        with ThreadPoolExecutor(max_workers=self.season_workers) as executor:
+            list(executor.map(self.extract_season_data, range(2012, 2021)))
+
+    def extract_season_data(self, season):
+        """Extracts the season stats for all players in the extraction list for one season.
+        A shallow copy of players20 is used, so each season keeps its own data while sharing the query object, the semaphore and the cache lock.
+
+        Parameters
+        ----------
+        season : int
+            the season that will be extracted
+
+        Returns
+        -------
+        None
+        """
+        copy.copy(self.players20).extract_players_season_data(season)
@@ -3,6 +3,9 @@ Use this module to import the Teams_Weekly_Data_Organizer class.
 
 Please be sure that the following libraries installed in the python Source folder:
 json, pandas, abc
+
+Optionally, install orjson to speed up reading the extracted data, ijson to read the weekly data one week at a time,
+numba to compile the weekly and players scoring, and pyarrow to also save the organized data as .parquet files.
 """
 
 __author__ = "Felipe P A Fraga (fisfraga)"
@@ -10,10 +13,149 @@ __email__ = "lipefraga@gmail.com"
 
 
 import json
+import os
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ijson
+except ImportError:
+    ijson = None
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:
+    pyarrow = None
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
 from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def load_json(data_dir):
+    """Loads the data saved in a json file, reading it in one go and parsing it with orjson when it is installed.
+
+    Parameters
+    ----------
+    data_dir : str
+        the path to the json file
+
+    Returns
+    ----------
+    data : dict or list
+        the data saved in the file
+    """
+    if orjson is not None:
+        with open(data_dir, 'rb') as json_file:
+            return orjson.loads(json_file.read())
+    with open(data_dir) as json_file:
+        return json.load(json_file)
+
+
+def score_week(stats):
+    """Scores every team of the week against every other team, in each scoring stat and in the head-to-head matchups.
+    A win in a stat is worth 1 and a tie 0.5; a matchup is won by winning more scoring stats than the opponent, and a tie is worth 0.5.
+    Compiled with numba when it is installed, comparing each pair of teams only once and scoring both sides,
+    and releasing the GIL so weeks organized in parallel threads are scored at the same time.
+
+    Parameters
+    ----------
+    stats : numpy.ndarray
+        matrix with one row for each scoring stat and one column for each team
+
+    Returns
+    ----------
+    stat_wins : numpy.ndarray
+        matrix with one row for each team and one column for the teams defeated in each scoring stat
+    matchup_wins : numpy.ndarray
+        the number of matchups each team would win this week
+    """
+    greater = stats[:, :, None] > stats[:, None, :]
+    ties = stats[:, :, None] == stats[:, None, :]
+    stat_wins = (greater.sum(axis=2) + 0.5 * (ties.sum(axis=2) - 1)).T
+    comparison = greater.view(np.int8) - greater.transpose(0, 2, 1).view(np.int8)
+    advantage = comparison.sum(axis=0)
+    matchup_wins = (advantage > 0).sum(axis=1) + 0.5 * ((advantage == 0).sum(axis=1) - 1)
+    return stat_wins, matchup_wins
+
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def score_week(stats):
+        num_stats, num_teams = stats.shape
+        stat_wins = np.zeros((num_teams, num_stats))
+        matchup_wins = np.zeros(num_teams)
+        for team in range(num_teams):
+            for opponent in range(team + 1, num_teams):
+                advantage = 0
+                for stat in range(num_stats):
+                    result = int(stats[stat, team] > stats[stat, opponent]) - int(stats[stat, team] < stats[stat, opponent])
+                    stat_wins[team, stat] += 0.5 * (result + 1)
+                    stat_wins[opponent, stat] += 0.5 * (1 - result)
+                    advantage += result
+                matchup_wins[team] += 0.5 * (np.sign(advantage) + 1)
+                matchup_wins[opponent] += 0.5 * (1 - np.sign(advantage))
+        return stat_wins, matchup_wins
+
+
+def score_players(stats, multipliers):
+    """Calculates the points made by each player in each stat category used to rank the players, and their total.
+    The percentages score the makes above or below the league average, with a different multiplier for each side.
+    Compiled with numba when it is installed.
+
+    Parameters
+    ----------
+    stats : numpy.ndarray
+        matrix with one row for each player and one column for each stat in Players_Data_Organizer.points_stats, in that order
+    multipliers : numpy.ndarray
+        the FG% multipliers above and below average, the FT% multipliers above and below average,
+        and the multipliers for 3PTM, PTS, REB, AST, ST, BLK and TO
+
+    Returns
+    ----------
+    points : numpy.ndarray
+        matrix with one row for each player and one column for each of the 9 categories, followed by the total
+    """
+    points = np.empty((stats.shape[0], 10))
+    attempted = np.where(stats[:, 0] > 0, stats[:, 0], 1)
+    fg_multiplier = np.where(stats[:, 2] > 0.46, multipliers[0], multipliers[1])
+    points[:, 0] = np.where(stats[:, 0] > 0, (stats[:, 1]/attempted - 0.46) * stats[:, 0] * fg_multiplier, 0)
+    attempted = np.where(stats[:, 3] > 0, stats[:, 3], 1)
+    ft_multiplier = np.where(stats[:, 5] > 0.78, multipliers[2], multipliers[3])
+    points[:, 1] = np.where(stats[:, 3] > 0, (stats[:, 4]/attempted - 0.78) * stats[:, 3] * ft_multiplier, 0)
+    points[:, 2:9] = stats[:, 6:13] * multipliers[4:11]
+    points[:, 9] = points[:, 0]
+    for category in range(1, 9):
+        points[:, 9] += points[:, category]
+    return points
+
+
+if njit is not None:
+    @njit(cache=True)
+    def score_players(stats, multipliers):
+        num_players = stats.shape[0]
+        points = np.zeros((num_players, 10))
+        for player in range(num_players):
+            if stats[player, 0] > 0:
+                fg_multiplier = multipliers[0] if stats[player, 2] > 0.46 else multipliers[1]
+                points[player, 0] = (stats[player, 1]/stats[player, 0] - 0.46) * stats[player, 0] * fg_multiplier
+            if stats[player, 3] > 0:
+                ft_multiplier = multipliers[2] if stats[player, 5] > 0.78 else multipliers[3]
+                points[player, 1] = (stats[player, 4]/stats[player, 3] - 0.78) * stats[player, 3] * ft_multiplier
+            for category in range(2, 9):
+                points[player, category] = stats[player, category + 4] * multipliers[category + 2]
+            total = points[player, 0]
+            for category in range(1, 9):
+                total += points[player, category]
+            points[player, 9] = total
+        return points
 
 
 class Data_Organizer(ABC):
@@ -26,6 +168,8 @@ class Data_Organizer(ABC):
         path to the directory in which the extracted data will be read from
     save_data_dir : str
         path to the directory where the organized data will be saved to
+    save_parquet_dir : str
+        path to the .parquet file where the organized data is also written as it is organized, None to save only the .csv file
     league_name : str
         the Yahoo Fantasy league's name
     season : str
@@ -59,10 +203,12 @@ class Data_Organizer(ABC):
         initializes a Data_Organizer object
     read_raw_data_json():
         reads the extracted data from a json file
-    check_if_empty_percentages(string):
-        sees if a percentage type stat is empty, if it is, replaces -'s with 0's
+    check_if_empty_percentages(stat_values):
+        sees which percentage type stats are empty and replaces their -'s with 0's
     save_data():
         saves the organized data into a csv file
+    save_to_csv(data, data_dir):
+        writes a DataFrame into a ';' separated .csv file
     """
 
     def __init__(self, setup):
@@ -80,6 +226,7 @@ class Data_Organizer(ABC):
 
         self.read_data_dir = setup.data_output_dir
         self.save_data_dir = setup.data_output_dir
+        self.save_parquet_dir = None
         self.league_name = setup.league_name
         self.season = setup.season
         self.num_teams = setup.num_teams
@@ -106,32 +253,27 @@ class Data_Organizer(ABC):
         None
         """
         try:
-            with open(self.read_data_dir) as json_file:
-                self.raw_data = json.load(json_file)
+            self.raw_data = load_json(self.read_data_dir)
         except FileNotFoundError:
             print("The extracted raw data was not found, please be sure that the data was extracted correctly")
             return False
         return True
 
-    def check_if_empty_percentages(self, string):
-        """Sees if a percentage type stat is empty, if it is, replaces -'s with 0's
+    def check_if_empty_percentages(self, stat_values):
+        """Sees which percentage type stats are empty and replaces their -'s with 0's, for a whole column of stats at once
 
         Parameters
         ----------
-        string : str
-            stat string to be checked
+        stat_values : numpy.ndarray
+            stat strings to be checked
 
         Returns
         ----------
-        string : str
-            corrected stat string
+        stat_values : numpy.ndarray
+            corrected stat strings
         """
-        if string == '-':
-            return '0'
-        elif string == '-/-':
-            return '0/0'
-        else:
-            return string
+        stat_values = np.asarray(stat_values, dtype=str)
+        return np.where(stat_values == '-', '0', np.where(stat_values == '-/-', '0/0', stat_values))
 
     def save_data(self):
         """Saves the organized data into a csv file
@@ -144,7 +286,23 @@ class Data_Organizer(ABC):
         ----------
         None
         """
-        self.final_data.to_csv(self.save_data_dir, sep=";")
+        self.save_to_csv(self.final_data, self.save_data_dir)
+
+    def save_to_csv(self, data, data_dir):
+        """Writes a DataFrame into a ';' separated .csv file, with the index as the first, unnamed, column
+
+        Parameters
+        ----------
+        data : pandas.core.frame.DataFrame
+            the DataFrame that will be saved
+        data_dir : str
+            path to the .csv file
+
+        Returns
+        ----------
+        None
+        """
+        data.to_csv(data_dir, sep=";")
 
 
 class Teams_Weekly_Data_Organizer(Data_Organizer):
@@ -161,6 +319,23 @@ class Teams_Weekly_Data_Organizer(Data_Organizer):
         the attribute that holds the pandas DataFrame with the organized data
     score_data : pandas.core.frame.DataFrame
         the attribute that holds the pandas DataFrame with the score data
+    save_score_parquet_dir : str
+        path to the .parquet file where the score data is also written as it is organized
+    fraction_map : dict
+        dictionary with the fraction stats names as keys and the names of their numerator and denominator as values
+    stat_plan : Array
+        list with one (stat key, column names, parser, column type) tuple for each extracted stat, built once by build_stat_plan()
+    stat_groups : Array
+        list with one (stat positions, column names of each stat, parser) tuple for each type of stat, built once by group_stat_plan()
+    week_workers : int
+        the number of weeks that are read and organized at the same time
+    header_columns : Array
+        list with one (column name, extracted key) tuple for each column copied as it is from the extracted data
+    scoring_columns : tuple
+        the names of the scoring stats columns, in the order of the rows of the matrix given to score_week()
+    team_dtype : pandas.CategoricalDtype
+        the categorical type shared by the Team column of every week, with the teams names as categories,
+        extended with any other name found while organizing the weeks
 
     Methods
     -------
@@ -170,12 +345,26 @@ class Teams_Weekly_Data_Organizer(Data_Organizer):
         saves the score_data attribute into a .csv file
     organize_week_data_headone():
         main method in the class, organizes the raw, extracted data into weekly stats and weekly score
-    create_dfs(week_data, week_score):
-        creates the DataFrames for week data and week score if they do not exist
-    update_dfs(week_data, week_score):
-        updates the DataFrames for week data and week score if they do exist
-    update_indexes():
-        updates the indexes of the week data an week score DataFrames
+    read_raw_weeks():
+        reads the extracted data one week at a time, streaming the json file when ijson is installed
+    stream_raw_weeks():
+        parses the extracted json file incrementally with ijson, one week at a time
+    write_week_parquet(writer, data_dir, week_columns):
+        appends a week's organized columns to a .parquet file, opening the file on the first week
+    concatenate_weeks(weeks_columns):
+        joins the organized columns of every week into a single DataFrame
+    build_stat_plan():
+        decides once how each extracted stat is parsed and into which columns it goes
+    group_stat_plan():
+        groups the stats of the stat plan that are parsed the same way, so each parser runs once per week
+    parse_fraction(stat_values):
+        parses a 'made/attempted' stat of every team into its two numbers
+    parse_percentage(stat_values):
+        parses a percentage stat of every team
+    parse_inverse(stat_values):
+        parses a stat where less is better of every team, making it negative
+    parse_count(stat_values):
+        parses a counting stat of every team
     organize_this_weeks_data(raw_data):
         called to organize the week data for a specific week's raw data
     initialize_week_data():
@@ -186,18 +375,6 @@ class Teams_Weekly_Data_Organizer(Data_Organizer):
         separates a stat name that represents 2 different pieces of information (Made and Attempted) into 2 diferent names
     generate_this_weeks_score(week_data):
         called to organize the week score for a specific week's week data
-    initialize_week_score():
-        used to create the dictionary that holds the week score
-    calculate_total_score(score, result, team):
-        fills in the dictionary with the score data for the week from the week data
-    calculate_stat_score(stat, team):
-        finds the number of wins a team has in a specific stat category
-    won_at_this_stat(team, opponent):
-        finds if a team has won against the opponent in a specific stat
-    calculate_matchup_wins(result, team):
-        calculates the total matchup wins for a specific team
-    compare_with_opponent(team, opponent):
-        for a specific stat, see if the team had a win, tie or loss against an opponent
     """
 
     def __init__(self, setup):
@@ -217,7 +394,17 @@ class Teams_Weekly_Data_Organizer(Data_Organizer):
         self.read_data_dir = setup.data_output_dir + "extraction_weekly_stats_" + str(self.season) + ".txt"
         self.save_data_dir = setup.data_output_dir + "data_weekly_stats_" + str(self.season) + ".csv"
         self.save_score_data_dir = setup.data_output_dir + "data_weekly_score_" + str(self.season) + ".csv"
+        self.save_parquet_dir = setup.data_output_dir + "data_weekly_stats_" + str(self.season) + ".parquet"
+        self.save_score_parquet_dir = setup.data_output_dir + "data_weekly_score_" + str(self.season) + ".parquet"
         self.score_data = None
+        self.fraction_map = {stat[0]: self.separate_fraction(stat[0]) for stat in self.stats_list if stat[1] == "fraction"}
+        self.stats_drop_list = [name for names in self.fraction_map.values() for name in names]
+        self.stat_plan = self.build_stat_plan()
+        self.stat_groups = self.group_stat_plan()
+        self.week_workers = 4
+        self.team_dtype = pd.CategoricalDtype(categories=list(dict.fromkeys(self.teams_names)))
+        self.scoring_columns = tuple(stat_name_and_type[0] for stat_name_and_type in self.scoring_stats_list)
+        self.header_columns = [("Year", "Season"), ("Week", "Week"), ("Team", "Team"), ("Manager", "Manager"), ("GP", "GP"), ("Win", "Win")]
         if self.league_scoring_type == "headone":
             self.organize_week_data_headone()
         else:
@@ -235,12 +422,16 @@ class Teams_Weekly_Data_Organizer(Data_Organizer):
         ----------
         None
         """
-        self.score_data.to_csv(self.save_score_data_dir, sep=";")
+        self.save_to_csv(self.score_data, self.save_score_data_dir)
 
     def organize_week_data_headone(self):
         """Main method in this class, organizes the raw, extracted data into weekly stats and weekly score.
         Automatically called when Teams_Weekly_Data_Organizer object is initialized.
-        Saves all the data in pre-determined directories for later use when generating visualizations
+        Saves all the data in pre-determined directories for later use when generating visualizations.
+        When pyarrow is installed, each week is also appended to the .parquet files as soon as it is organized,
+        so they are written without converting the whole season at once.
+        When ijson is installed, each week's raw data is read only when it is organized and released right after.
+        The weeks are organized week_workers at a time in parallel, and collected in order.
 
         Parameters
         ----------
@@ -250,21 +441,36 @@ class Teams_Weekly_Data_Organizer(Data_Organizer):
         ----------
         None
         """
-        data_present = self.read_raw_data_json()
-        if data_present == False:
+        raw_weeks = self.read_raw_weeks()
+        if raw_weeks is None:
             print("The data will not be organized, please try again after extracting the data")
         else:
             print("Organizing season " + str(self.season) + " data from week 1 to", self.current_week, "\n")
-            first = True
-            for week in range(1, len(self.raw_data.keys())+1):
-                week_data, week_score = self.organize_this_weeks_data(self.raw_data[str(week)])
-                if first is True:
-                    first = False
-                    self.create_dfs(week_data, week_score)
-                else:
-                    self.update_dfs(week_data, week_score)
-
-            self.update_indexes()
+            data_chunks = []
+            score_chunks = []
+            data_writer = None
+            score_writer = None
+            try:
+                with ThreadPoolExecutor(max_workers=self.week_workers) as executor:
+                    for weeks_batch in iter(lambda: [week_raw_data for _, week_raw_data in islice(raw_weeks, self.week_workers)], []):
+                        for week_data, week_score in executor.map(self.organize_this_weeks_data, weeks_batch):
+                            new_names = [name for name in week_data["Team"] if name not in self.team_dtype.categories]
+                            if new_names:
+                                self.team_dtype = pd.CategoricalDtype(categories=list(self.team_dtype.categories) + list(dict.fromkeys(new_names)))
+                            week_data["Team"] = pd.Categorical(week_data["Team"], dtype=self.team_dtype)
+                            week_score["Team"] = week_data["Team"]
+                            data_chunks.append(week_data)
+                            score_chunks.append(week_score)
+                            if pyarrow is not None:
+                                data_writer = self.write_week_parquet(data_writer, self.save_parquet_dir, week_data)
+                                score_writer = self.write_week_parquet(score_writer, self.save_score_parquet_dir, week_score)
+            finally:
+                for writer in [data_writer, score_writer]:
+                    if writer is not None:
+                        writer.close()
+            self.final_data = self.concatenate_weeks(data_chunks)
+            self.score_data = self.concatenate_weeks(score_chunks)
+
             self.save_data()
             self.save_score_data()
             print("Data Organized for" + str(self.league_name) + "!\n")
@@ -272,89 +478,95 @@ class Teams_Weekly_Data_Organizer(Data_Organizer):
 
 
 
-    def create_dfs(self, week_data, week_score):
-        """Creates the DataFrames for week data and week score if they do not exist
+    def read_raw_weeks(self):
+        """Reads the extracted data one week at a time, in the order the weeks were saved.
+        When ijson is installed the json file is streamed, so only the week being organized is held in memory,
+        otherwise the whole file is read into the raw_data attribute first.
 
         Parameters
         ----------
-        week_data : dict
-            the organized week data for the first week
-        week_score : dict
-            the organized week score for the first week
+        None
 
         Returns
         ----------
-        None
+        raw_weeks : iterator
+            (week, raw data of the week) pairs, None if the extracted data was not found
         """
-        self.final_data = pd.DataFrame.from_dict(week_data)
-        self.score_data = pd.DataFrame.from_dict(week_score) 
+        if ijson is None:
+            if self.read_raw_data_json() == False:
+                return None
+            return iter(self.raw_data.items())
+        if not os.path.isfile(self.read_data_dir):
+            print("The extracted raw data was not found, please be sure that the data was extracted correctly")
+            return None
+        return self.stream_raw_weeks()
 
-    def update_dfs(self, week_data, week_score):
-        """Updates the DataFrames for week data and week score if they do exist
+    def stream_raw_weeks(self):
+        """Parses the extracted json file incrementally with ijson, yielding each week as soon as it is read
 
         Parameters
         ----------
-        week_data : dict
-            the organized week data for an intermediary week
-        week_score : dict
-            the organized week score for an intermediary week
+        None
 
         Returns
         ----------
-        None
+        raw_weeks : generator
+            (week, raw data of the week) pairs
         """
-        temp_df = pd.DataFrame.from_dict(week_data)
-        copy_all_data = self.final_data.copy()
-        self.final_data = pd.concat([copy_all_data, temp_df])
-        temp_score = pd.DataFrame.from_dict(week_score)
-        copy_all_score = self.score_data.copy()
-        self.score_data = pd.concat([copy_all_score, temp_score])
+        with open(self.read_data_dir, 'rb') as json_file:
+            yield from ijson.kvitems(json_file, '', use_float=True)
 
-    def update_indexes(self):
-        """Updates the indexes of the week data an week score DataFrames
+    def write_week_parquet(self, writer, data_dir, week_columns):
+        """Appends a week's organized columns to a .parquet file.
+        The file is opened on the first week, using that week's columns as the schema.
 
         Parameters
         ----------
-        None
+        writer : pyarrow.parquet.ParquetWriter
+            the writer for the .parquet file, None before the first week
+        data_dir : str
+            path to the .parquet file
+        week_columns : dict
+            the organized data for one week, with one array for each column
 
         Returns
         ----------
-        None
+        writer : pyarrow.parquet.ParquetWriter
+            the writer for the .parquet file
         """
-        self.final_data.reset_index(inplace=True)
-        self.final_data.rename(columns={"index": "Team_id"}, inplace = True)
-        self.final_data['Team_id'] = self.final_data['Team_id'].add(1)
+        table = pyarrow.table(week_columns)
+        if writer is None:
+            writer = pq.ParquetWriter(data_dir, table.schema, compression="snappy")
+        writer.write_table(table)
+        return writer
 
-        self.score_data.reset_index(inplace=True)
-        self.score_data.rename(columns={"index": "Team_id"}, inplace = True)
-        self.score_data['Team_id'] = self.score_data['Team_id'].add(1)
-
-    def organize_this_weeks_data(self, raw_data):
-        """Central method that is called to organize the raw data into structured data for a specific week's raw data
+    def concatenate_weeks(self, weeks_columns):
+        """Joins the organized columns of every week into a single DataFrame,
+        concatenating each column once instead of building and concatenating one DataFrame per week.
+        The DataFrame adopts the concatenated arrays without copying them again.
 
         Parameters
         ----------
-        raw_data : dict
-            the entire unstructured data for only one week
+        weeks_columns : Array
+            list with the organized data of each week, as dictionaries with one array for each column
 
         Returns
         ----------
-        week_data : dict
-            the organized week data
-        week_score : dict
-            the organized week score
+        data : pandas.core.frame.DataFrame
+            the organized data for all weeks
         """
-        week_data = self.initialize_week_data()
-        week_data = self.fill_in_week_data(week_data, raw_data)
-        week_score = self.generate_this_weeks_score(week_data)
-        week_data["Score"] = week_score["Score"]
-        week_data["Matchup_Wins"] = week_score["Matchup_Wins"]
-        week_data["Week_Result"] = week_score["Week_Result"]
-
-        return week_data, week_score
+        columns = {}
+        for column in weeks_columns[0]:
+            if column == "Team":
+                codes = np.concatenate([week_columns[column].codes for week_columns in weeks_columns])
+                columns[column] = pd.Categorical.from_codes(codes, dtype=self.team_dtype)
+            else:
+                columns[column] = np.concatenate([week_columns[column] for week_columns in weeks_columns])
+        return pd.DataFrame(columns, copy=False)
 
-    def initialize_week_data(self):
-        """Used to create the dictionary that holds the week data
+    def build_stat_plan(self):
+        """Decides once how each extracted stat is parsed and into which columns of the week data it goes,
+        so the type of each stat is not checked again for every team and week.
 
         Parameters
         ----------
@@ -362,248 +574,233 @@ class Teams_Weekly_Data_Organizer(Data_Organizer):
 
         Returns
         ----------
-        week_data : dict
-            empty dictionary which will be filled in by fill_in_week_data():
+        stat_plan : Array
+            list with one (stat key, column names, parser, column type) tuple for each extracted stat
         """
-        week_data = {}
-        week_data["Year"] = []
-        week_data["Week"] = []
-        week_data["Team"] = []
-        week_data["Manager"] = []
-        for stat in self.stats_list:
+        stat_plan = []
+        for i, stat in enumerate(self.stats_list):
+            stat_key = str(i+1)
             if stat[1] == "fraction":
-                numerator, denominator = self.separate_fraction(stat[0])
-                week_data[numerator] = []
-                week_data[denominator] = []
-                self.stats_drop_list.append(numerator)
-                self.stats_drop_list.append(denominator)
+                stat_plan.append((stat_key, self.fraction_map[stat[0]], self.parse_fraction, np.int32))
+            elif stat[1] == "percentage":
+                stat_plan.append((stat_key, (stat[0],), self.parse_percentage, np.float32))
+            elif stat[1] == "inverse":
+                stat_plan.append((stat_key, (stat[0],), self.parse_inverse, np.int32))
             else:
-                week_data[stat[0]] = []
-        week_data["GP"] = []
-        week_data["Win"] = []
-        return week_data
+                stat_plan.append((stat_key, (stat[0],), self.parse_count, np.int32))
+        return stat_plan
 
-    def fill_in_week_data(self, week_data, raw_data):
-        """Used to fill in the dictionary that holds the week data
+    def group_stat_plan(self):
+        """Groups the stats of the stat plan that are parsed the same way,
+        so that each parser converts all of its stats for all teams in a single call every week.
 
         Parameters
         ----------
-        week_data : dict
-            empty dictionary created by initialize_week_data():
-        raw_data : dict
-            the entire unstructured data for only one week
+        None
 
         Returns
         ----------
-        week_data : dict
-            dictionary with the week's data for each team
+        stat_groups : Array
+            list with one (stat positions, column names of each stat, parser) tuple for each parser in the stat plan
         """
-        for team_data in raw_data:
-            week_data["Year"].append(team_data["Season"])
-            week_data["Week"].append(team_data["Week"])
-            week_data["Team"].append(team_data["Team"])
-            week_data["Manager"].append(team_data["Manager"])
-            for i in range(self.stat_count):
-                stat_value = team_data[str(i+1)]
-                if self.stats_list[i][1] == "fraction":
-                    numerator, denominator = self.separate_fraction(self.stats_list[i][0])
-                    stat_num, stat_den = self.check_if_empty_percentages(stat_value.split('/'))
-                    week_data[numerator].append(int(stat_num))
-                    week_data[denominator].append(int(stat_den))
-                elif self.stats_list[i][1] == "percentage":
-                    week_data[self.stats_list[i][0]].append(float(stat_value))
-                elif self.stats_list[i][1] == "inverse":
-                    week_data[self.stats_list[i][0]].append(-1*int(stat_value))
-                else:
-                    week_data[self.stats_list[i][0]].append(int(stat_value))
-            week_data["GP"].append(int(team_data["GP"]))
-            week_data["Win"].append(team_data["Win"])
-        return week_data
+        groups = {}
+        for i, (_, columns, parser, _) in enumerate(self.stat_plan):
+            positions, stats_columns = groups.setdefault(parser, ([], []))
+            positions.append(i)
+            stats_columns.append(columns)
+        return [(np.array(positions), stats_columns, parser) for parser, (positions, stats_columns) in groups.items()]
 
-    def separate_fraction(self, stat_name):
-        """Mehod that separates a stat name that has a '/' which denotes a fraction,
-        which will be divided into 2 entries, one for numerator, one for the denominator.
+    def parse_fraction(self, stat_values):
+        """Parses a stat that represents a fraction, 'made/attempted', into its two numbers for all teams at once.
+        Empty stats, '-' or '-/-', are read as '0/0'.
 
         Parameters
         ----------
-        stat_name : str
-            stat name for a fraction that will be divided into 'made' and 'attempted'
+        stat_values : numpy.ndarray
+            the extracted values of every team, one column for each stat
 
         Returns
         ----------
-        numerator : str
-            stat name for 'made something'
-        denominator : str
-            stat name for 'attempts of something'
+        values : tuple
+            the numerators and the denominators
         """
-        return stat_name.split("/")[0], stat_name.split("/")[0][0:-len(stat_name.split("/")[1])] + stat_name.split("/")[1]
+        values = np.asarray(stat_values, dtype=str)
+        values = np.where(np.isin(values, ['-', '-/-']), '0/0', values)
+        parts = np.char.partition(values, '/')
+        return parts[..., 0].astype(np.int32), parts[..., 2].astype(np.int32)
 
-    def generate_this_weeks_score(self, week_data):
-        """Organizes the week score for a specific week's week data
+    def parse_percentage(self, stat_values):
+        """Parses a stat that represents a percentage for all teams at once, reading empty stats, '-', as 0
 
         Parameters
         ----------
-        week_data : dict
-            dictionary with the week's data for each team
+        stat_values : numpy.ndarray
+            the extracted values of every team, one column for each stat
+
         Returns
         ----------
-        score : dict
-            dictionary with the week's score for each team
+        values : tuple
+            the percentages as floats
         """
-        score = self.initialize_week_score()
-        for team_id in range(self.num_teams):
-            score = self.calculate_total_score(score, week_data, team_id)
-
-        return score
+        return (self.check_if_empty_percentages(stat_values).astype(np.float32),)
 
-    def initialize_week_score(self):
-        """Used to create the dictionary that holds the week score
+    def parse_inverse(self, stat_values):
+        """Parses a stat where less is better for all teams at once, making it negative so that more is better like for the other stats
 
         Parameters
         ----------
-        None
+        stat_values : numpy.ndarray
+            the extracted values of every team, one column for each stat
 
         Returns
         ----------
-        score : dict
-            empty dictionary which will be filled in by calculate_total_score():
+        values : tuple
+            the negative of the stats
         """
-        score = {}
-        score["Year"] = []
-        score["Week"] = []
-        score["Team"] = []
-        score["Manager"] = []
-        for stat in self.scoring_stats_list:
-            score[stat[0]] = []
-        score["Score"] = []
-        score["Matchup_Wins"] = []
-        score["Week_Result"] = []
-        return score
+        return (-1*np.asarray(stat_values, dtype=np.int32),)
 
-    def calculate_total_score(self, score, week_data, team):
-        """Used to fill in the dictionary that holds the week data
+    def parse_count(self, stat_values):
+        """Parses a counting stat for all teams at once
 
         Parameters
         ----------
-        score : dict
-            empty dictionary created by initialize_week_score():
-        week_data : dict
-            the entire unstructured data for only one week
-        team : int
-            team identifier to access data
+        stat_values : numpy.ndarray
+            the extracted values of every team, one column for each stat
 
         Returns
         ----------
-        score : dict
-            dictionary with the week's score for each team
+        values : tuple
+            the stats as integers
         """
-        score["Year"].append(week_data["Year"][team])
-        score["Week"].append(week_data["Week"][team])
-        score["Team"].append(week_data["Team"][team])
-        score["Manager"].append(week_data["Manager"][team])
-        total_score = 0
-        for stat_name_and_type in self.scoring_stats_list:
-            stat_score = self.calculate_stat_score(week_data[stat_name_and_type[0]], team)
-            score[stat_name_and_type[0]].append(stat_score)
-            total_score += stat_score
-        score["Score"].append(round(total_score, 1))
-        score["Matchup_Wins"].append(round(self.calculate_matchup_wins(week_data, team), 1))
-        score["Week_Result"].append(week_data["Win"][team])
-        return score
+        return (np.asarray(stat_values, dtype=np.int32),)
 
-    def calculate_stat_score(self, stat, team):
-        """Finds the number of wins a team has in a specific stat category
+    def organize_this_weeks_data(self, raw_data):
+        """Central method that is called to organize the raw data into structured data for a specific week's raw data
 
         Parameters
         ----------
-        stat : dict
-            the values of a specific stat for all teams
-        team : int
-            team identifier to access data
+        raw_data : dict
+            the entire unstructured data for only one week
 
         Returns
         ----------
-        teams_defeated : int
-            the teams defeated (the score) for this team in this stat
+        week_data : dict
+            the organized week data
+        week_score : dict
+            the organized week score
         """
-        teams_defeated = 0
-        for i in range(len(stat)):
-            if i != team:
-                teams_defeated += self.won_at_this_stat(stat[team], stat[i])
-        return teams_defeated
+        week_data = self.initialize_week_data()
+        week_data = self.fill_in_week_data(week_data, raw_data)
+        week_score = self.generate_this_weeks_score(week_data)
+        week_data["Score"] = week_score["Score"]
+        week_data["Matchup_Wins"] = week_score["Matchup_Wins"]
+        week_data["Week_Result"] = week_score["Week_Result"]
+
+        return week_data, week_score
 
-    def won_at_this_stat(self, team, opponent):
-        """Finds if a team has won against the opponent in a specific stat
+    def initialize_week_data(self):
+        """Used to create the dictionary that holds the week data
 
         Parameters
         ----------
-        team : float
-            the stat value for the team having the score calculated
-        opponent : float
-            the stat value for the opponent
+        None
 
         Returns
         ----------
-        points : float
-            the score for the team against the opponent
+        week_data : dict
+            dictionary with one preallocated array per column, which will be filled in by fill_in_week_data():
+            uint16 for the Year, uint8 for the Week, int32 for the Team_id and the counting stats,
+            float32 for the percentages and the results, object for the names
         """
-        if team > opponent:
-            return 1
-        elif team == opponent:
-            return 0.5
-        else:
-            return 0
+        week_data = {}
+        week_data["Team_id"] = np.arange(1, self.num_teams + 1, dtype=np.int32)
+        week_data["Year"] = np.empty(self.num_teams, dtype=np.uint16)
+        week_data["Week"] = np.empty(self.num_teams, dtype=np.uint8)
+        week_data["Team"] = np.empty(self.num_teams, dtype=object)
+        week_data["Manager"] = np.empty(self.num_teams, dtype=object)
+        for _, columns, _, column_type in self.stat_plan:
+            for column in columns:
+                week_data[column] = np.empty(self.num_teams, dtype=column_type)
+        week_data["GP"] = np.empty(self.num_teams, dtype=np.int32)
+        week_data["Win"] = np.empty(self.num_teams, dtype=np.float32)
+        return week_data
 
-    def calculate_matchup_wins(self, week_data, team):
-        """Calculates the total matchup wins for a specific team
+    def fill_in_week_data(self, week_data, raw_data):
+        """Used to fill in the dictionary that holds the week data
 
         Parameters
         ----------
         week_data : dict
-            dictionary with the week's data for each team
-        team : int
-            team identifier to access data
+            dictionary of preallocated arrays created by initialize_week_data():
+        raw_data : dict
+            the entire unstructured data for only one week
 
         Returns
         ----------
-        wins : float
-            the number of matchups a team would win this week
+        week_data : dict
+            dictionary with the week's data for each team
         """
-        wins = 0
-        for i in range(self.num_teams):
-            if i != team:
-                advantage = 0
-                for stat_name_and_type in self.scoring_stats_list:
-                    stat = week_data[stat_name_and_type[0]]
-                    advantage += self.compare_with_opponent(stat[team], stat[i])
-                if advantage > 0:
-                    wins += 1
-                elif advantage == 0:
-                    wins += 0.5
-
-        return wins
+        for column, key in self.header_columns:
+            week_data[column][:] = [team_data[key] for team_data in raw_data]
+        stat_keys = [stat_key for stat_key, _, _, _ in self.stat_plan]
+        raw_stats = np.array([[team_data[stat_key] for stat_key in stat_keys] for team_data in raw_data], dtype=object)
+        for positions, stats_columns, parser in self.stat_groups:
+            parsed_stats = parser(raw_stats[:, positions])
+            for i, columns in enumerate(stats_columns):
+                for column, values in zip(columns, parsed_stats):
+                    week_data[column][:] = values[:, i]
+        return week_data
 
-    def compare_with_opponent(self, team, opponent):
-        """For a specific stat, see if the team had a win, tie or loss against an opponent
+    def separate_fraction(self, stat_name):
+        """Mehod that separates a stat name that has a '/' which denotes a fraction,
+        which will be divided into 2 entries, one for numerator, one for the denominator.
 
         Parameters
         ----------
-        team : float
-            the stat value for the team having the score calculated
-        opponent : float
-            the stat value for the opponent
+        stat_name : str
+            stat name for a fraction that will be divided into 'made' and 'attempted'
 
         Returns
         ----------
-        result : int
-            returns the margin of vitory for this stat, 1 for win, 0.5 for draw, -1 for loss
+        numerator : str
+            stat name for 'made something'
+        denominator : str
+            stat name for 'attempts of something'
         """
-        if team > opponent:
-            return 1
-        elif team == opponent:
-            return 0
-        else:
-            return -1
+        made, attempted = stat_name.split("/")
+        return made, made[0:-len(attempted)] + attempted
+
+    def generate_this_weeks_score(self, week_data):
+        """Organizes the week score for a specific week's week data
+
+        Parameters
+        ----------
+        week_data : dict
+            dictionary with the week's data for each team
+        Returns
+        ----------
+        score : dict
+            dictionary with the week's score for each team
+        """
+        stats = np.empty((len(self.scoring_columns), self.num_teams), dtype=np.float64)
+        for i, column in enumerate(self.scoring_columns):
+            stats[i] = week_data[column]
+        stat_wins, matchup_wins = score_week(stats)
+        stat_wins = stat_wins.astype(np.float32)
+        matchup_wins = matchup_wins.astype(np.float32)
+
+        score = {}
+        score["Team_id"] = week_data["Team_id"]
+        score["Year"] = week_data["Year"]
+        score["Week"] = week_data["Week"]
+        score["Team"] = week_data["Team"]
+        score["Manager"] = week_data["Manager"]
+        for i, column in enumerate(self.scoring_columns):
+            score[column] = stat_wins[:, i]
+        score["Score"] = np.round(stat_wins.sum(axis=1), 1)
+        score["Matchup_Wins"] = np.round(matchup_wins, 1)
+        score["Week_Result"] = week_data["Win"]
+        return score
 
 
 
@@ -627,10 +824,17 @@ class Players_Data_Organizer(Data_Organizer):
         list of stats that are dependent on the number of games, considering advanced stats
     num_stats_advanced : int
         number of stats extracted for each player, considering advanced stats
+    points_multiplier : dict
+        the points given by each stat category, with the (above, below) average multipliers for the percentages
+    points_stats : tuple
+        the columns of the average stats that are used to calculate the points
+    info_columns : Array
+        the columns of the average stats with the descriptive information of the players (name, team, team abbreviation, position), stored as categories
     player_info : dict
-        dictionary with the descriptive information of the players, name, team, position
+        dictionary with a pandas DataFrame for each season, with the descriptive information of the players, name, position, team, and one row for each player,
+        kept as plain object columns instead of categories, since the analyzer copies it for its rankings
     points_breakdown : dict
-        dictionary with the points made by each stat category for each player
+        dictionary with a pandas DataFrame for each season, with one column for the points made in each stat category and one row for each player
     avg_dfs : dict
         dictionary with pandas DataFrames containing the average stats for each player in the season
     X_dfs : dict
@@ -641,6 +845,8 @@ class Players_Data_Organizer(Data_Organizer):
         dictionary with pandas DataFrames containing the average stats for each player in the season
     X_dfs_advanced : dict
         dictionary with pandas DataFrames containing the stats that will input the model, considering advanced stats
+    season_workers : int
+        the number of seasons that are organized at the same time
 
 
     Methods
@@ -651,11 +857,13 @@ class Players_Data_Organizer(Data_Organizer):
         reads any .json file and returns the raw_data
     organize_player_data():
         main method in the class, organizes the raw, extracted data into the season data for each player
+    organize_season_data(season):
+        organizes the data of a single season, so the seasons can be organized in parallel
     create_average_stats(raw_dict, stats_to_take_average):
-        receives the raw data and returns the average data for each player in the dict
+        receives the raw data and returns a DataFrame with the average data for each player
     pre_process_data(avg_dfs, X_columns):
         filters the average data for the chosen columns for the model to predict the rankings next season
-    calculate_points(avg_stats_df):
+    calculate_points(avg_stats_df, season):
         using the average stats for the season, calculates the points used to rank the players, for each player
     """
 
@@ -673,7 +881,8 @@ class Players_Data_Organizer(Data_Organizer):
         self.read_data_dir = setup.data_output_dir + "extraction_"
         self.save_data_dir = setup.data_output_dir + "data_league_teams_past_stats_week_" + str(self.current_week) + ".csv"
         self.active_players_list = self.read_raw_data_json(self.read_data_dir + "relevant_player_ids.txt")
-        self.active_players_list = list(set(self.active_players_list))
+        self.active_players_list = list(dict.fromkeys(self.active_players_list))
+        self.season_workers = 4
         self.organize_player_data(pre_process_stats)
         
 
@@ -691,8 +900,7 @@ class Players_Data_Organizer(Data_Organizer):
             the data read from the .json file
         """
         try:
-            with open(data_dir) as json_file:
-                raw_data = json.load(json_file)
+            raw_data = load_json(data_dir)
         except FileNotFoundError:
             print("The extracted raw data was not found, please be sure that the data was extracted correctly")
             return 0
@@ -703,6 +911,7 @@ class Players_Data_Organizer(Data_Organizer):
         """Main method in the class, organizes the raw, extracted data into the season data for each player.
         Automatically called when Players_Data_Organizer object is initialized.
         Saves all the data in pre-determined directories for later use when generating visualizations
+        The seasons are independent, so up to season_workers of them are organized at the same time.
 
         Parameters
         ----------
@@ -727,44 +936,63 @@ class Players_Data_Organizer(Data_Organizer):
         self.stats_to_take_average_advanced = [8, 9, 10, 12, 13, 15, 16, 18, 19, 20, 21, 22, 23, 24, 25, 27, 34, 35, 42, 43]
         self.num_stats_advanced = 51
 
-        self.player_info = {}
-        self.points_breakdown = {}
+        self.points_multiplier = {'FG%' : (8, 9), 'FT%' : (15, 10), '3PTM' : 6, 'PTS' : 0.8, \
+        'REB' : 1.8, 'AST' : 3, 'ST' : 13, 'BLK' : 9, 'TO' : -4}
+        self.points_stats = (9, 10, 11, 12, 13, 14, 16, 18, 21, 22, 23, 24, 25)
+        self.info_columns = [2, 3, 4, 5]
 
-        self.avg_dfs = {}
-        self.X_dfs = {}
-        self.y_dfs = {}
+        seasons = range(2012, 2021)
+        advanced_seasons = [season for season in seasons if season > 2016]
+        self.player_info = dict.fromkeys(seasons)
+        self.points_breakdown = dict.fromkeys(seasons)
 
-        self.avg_dfs_advanced = {}
-        self.X_dfs_advanced = {}
-        
+        self.avg_dfs = dict.fromkeys(seasons)
+        self.X_dfs = dict.fromkeys(seasons)
+        self.y_dfs = dict.fromkeys(seasons)
+
+        self.avg_dfs_advanced = dict.fromkeys(advanced_seasons)
+        self.X_dfs_advanced = dict.fromkeys(advanced_seasons)
+
+        with ThreadPoolExecutor(max_workers=self.season_workers) as executor:
+            list(executor.map(self.organize_season_data, seasons))
+        self.season = seasons[-1]
+
+    def organize_season_data(self, season):
+        """Organizes the data of a single season, filling in that season's entry in the season dictionaries.
+        Each season only reads its own files and writes its own entries, so the seasons can be organized in parallel.
+
+        Parameters
+        ----------
+        season : int
+            the season that will be organized
 
-        for season in range(2012, 2021):
-            self.season = season
-            self.points_breakdown[season] = {}
-            read_data_dict = self.read_data_dir + "players_dict_" + str(season) + ".txt"
-            data = self.read_raw_data_json(read_data_dict)
-            
-            for player_id in self.active_players_list:
-                if player_id not in list(data.keys()):
-                    data[player_id] = [0]*self.num_stats
-            avg = self.create_average_stats(data, self.stats_to_take_average)
-            self.avg_dfs[season] = pd.DataFrame.from_dict(avg, orient='index')
-            self.X_dfs[season] = self.pre_process_data(self.avg_dfs[season], self.X_columns)
-            self.y_dfs[season] = pd.DataFrame.from_dict(self.calculate_points(self.avg_dfs[season]), orient='index') 
-            
-            if season > 2016:
-                read_advanced_data_dict = self.read_data_dir + "players_dict_advanced_" + str(season) + ".txt"
-                advanced_data = self.read_raw_data_json(read_advanced_data_dict)
-
-                for player_id in self.active_players_list:
-                    if player_id not in list(advanced_data.keys()):
-                        advanced_data[player_id] = [0]*self.num_stats_advanced
-                advanced_avg = self.create_average_stats(advanced_data, self.stats_to_take_average_advanced)
-                self.avg_dfs_advanced[season] = pd.DataFrame.from_dict(advanced_avg, orient='index')
-                self.X_dfs_advanced[season] = self.pre_process_data(self.avg_dfs_advanced[season], self.X_columns_advanced)
+        Returns
+        ----------
+        None
+        """
+        read_data_dict = self.read_data_dir + "players_dict_" + str(season) + ".txt"
+        data = self.read_raw_data_json(read_data_dict)
+
+        missing_players = [player_id for player_id in self.active_players_list if player_id not in data]
+        data.update(dict.fromkeys(missing_players, [0]*self.num_stats))
+        self.avg_dfs[season] = self.create_average_stats(data, self.stats_to_take_average)
+        self.X_dfs[season] = self.pre_process_data(self.avg_dfs[season], self.X_columns)
+        points = self.calculate_points(self.avg_dfs[season], season)
+        self.y_dfs[season] = pd.DataFrame(np.fromiter(points.values(), dtype=np.float64, count=len(points)), index=self.avg_dfs[season].index, copy=False)
+
+        if season > 2016:
+            read_advanced_data_dict = self.read_data_dir + "players_dict_advanced_" + str(season) + ".txt"
+            advanced_data = self.read_raw_data_json(read_advanced_data_dict)
+
+            missing_players = [player_id for player_id in self.active_players_list if player_id not in advanced_data]
+            advanced_data.update(dict.fromkeys(missing_players, [0]*self.num_stats_advanced))
+            self.avg_dfs_advanced[season] = self.create_average_stats(advanced_data, self.stats_to_take_average_advanced)
+            self.X_dfs_advanced[season] = self.pre_process_data(self.avg_dfs_advanced[season], self.X_columns_advanced)
 
     def create_average_stats(self, raw_dict, stats_to_take_average):
-        """Receives the raw data and returns the average data for each player in the dict
+        """Receives the raw data and returns the average data for each player,
+        dividing the stats of all players that have played by their games in a single numpy operation.
+        The descriptive columns repeat the same few teams and positions for every player, so they are kept as categories
 
         Parameters
         ----------
@@ -775,16 +1003,15 @@ class Players_Data_Organizer(Data_Organizer):
         
         Returns
         --------
-        data : dict
-            average_data for each player
+        avg_df : pandas.core.frame.DataFrame
+            DataFrame with the average data for each player
         """
-        data = raw_dict.copy()
-        for key in list(raw_dict.keys()):
-            for stat_position in stats_to_take_average:
-                if data[key][6] > 0:
-                    data[key][stat_position] = float(data[key][stat_position])/float((data[key][6]))
-        
-        return data
+        avg_df = pd.DataFrame(list(raw_dict.values()), index=list(raw_dict.keys()))
+        games = avg_df[6].to_numpy(dtype=np.float64)
+        totals = avg_df[stats_to_take_average].to_numpy(dtype=np.float64, copy=True)
+        avg_df[stats_to_take_average] = np.divide(totals, games[:, None], out=totals, where=games[:, None] > 0)
+        avg_df[self.info_columns] = avg_df[self.info_columns].astype("category")
+        return avg_df
 
 
     def pre_process_data(self, avg_df, X_columns):
@@ -805,67 +1032,32 @@ class Players_Data_Organizer(Data_Organizer):
         return avg_df[X_columns].copy()
 
 
-    def calculate_points(self, avg_stats_df):
-        """
+    def calculate_points(self, avg_stats_df, season):
+        """Calculates the points used to rank the players, scoring all players of the season at once with score_players()
+        The scoring stats are copied in a single row-major float64 block, so each player's stats are read contiguously.
+        float64 is kept, because the percentages are compared with the league averages and must not be rounded across them
 
         Parameters
         ----------
         avg_stats_df : pandas.core.frame.DataFrame
             DataFrame with the stats for each player
+        season : int
+            the season of the stats
 
         Returns
         --------
         points_dict : dict
             dictionary with the points for each player for the season
         """
-        multiplier = {'FG%' : [8, 9], 'FT%' : [15, 10], '3PTM' : 6, 'PTS' : 0.8, \
-        'REB' : 1.8, 'AST' : 3, 'ST' : 13, 'BLK' : 9, 'TO' : -4}
-        points_dict = {}
-        player_info = {}
-
-        for index, row in avg_stats_df.iterrows():
-            player_stats = row
-            player_id = index
-            points = 0
-            points_list = [self.season, player_stats[2]]
-            #FG%
-            if player_stats[11] > 0.46:
-                pos = 0
-            else:
-                pos = 1
-            if player_stats[9] > 0:
-                points_list.append((player_stats[10]/player_stats[9] - 0.46) * player_stats[9] * multiplier['FG%'][pos])
-            else:
-                points_list.append(0)
-            #FT%
-            if player_stats[14] > 0.78:
-                pos = 0
-            else:
-                pos = 1
-            if player_stats[12] > 0:
-                points_list.append((player_stats[13]/player_stats[12] - 0.78) * player_stats[12] * multiplier['FT%'][pos])
-            else:
-                points_list.append(0)
-            #3PTM
-            points_list.append(player_stats[16] * multiplier['3PTM'])
-            #PTS
-            points_list.append(player_stats[18] * multiplier['PTS'])
-            #REB
-            points_list.append(player_stats[21] * multiplier['REB'])
-            #AST
-            points_list.append(player_stats[22] * multiplier['AST'])
-            #ST
-            points_list.append(player_stats[23] * multiplier['ST'])
-            #BLK
-            points_list.append(player_stats[24] * multiplier['BLK'])
-            #TO
-            points_list.append(player_stats[25] * multiplier['TO'])
-            #Total
-            points_list.append(sum(points_list[2:11]))
-            points_dict[player_id] = points_list[11]
-            self.points_breakdown[self.season][player_id] = points_list
-            player_info[player_id] = [player_stats[2], player_stats[5], player_stats[4]]
-        
-        self.player_info[self.season] = player_info
+        multiplier = self.points_multiplier
+        multipliers = np.array([*multiplier['FG%'], *multiplier['FT%'], multiplier['3PTM'], multiplier['PTS'], multiplier['REB'], \
+        multiplier['AST'], multiplier['ST'], multiplier['BLK'], multiplier['TO']], dtype=np.float64)
+        stats = np.ascontiguousarray(avg_stats_df[list(self.points_stats)].to_numpy(dtype=np.float64))
+        points = score_players(stats, multipliers)
+
+        points_dict = dict(zip(avg_stats_df.index.tolist(), points[:, 9].tolist()))
+        breakdown = dict(zip(['FG%', 'FT%', '3PTM', 'PTS', 'REB', 'AST', 'ST', 'BLK', 'TO', 'Total'], points.T))
+        self.points_breakdown[season] = pd.DataFrame({'Season': season, 'Name': avg_stats_df[2], **breakdown}, index=avg_stats_df.index)
+        self.player_info[season] = avg_stats_df[[2, 5, 4]].set_axis(['Player', 'Position', 'Team'], axis=1).astype(object)
 
         return points_dict
@@ -2,7 +2,7 @@
 Use this module to import the SetUp class, which is responsible for creating the setup object which will be used to initialize other classes.
 
 Please be sure that the following libraries installed in the python Source folder:
-os, unicodedata, csv, logging
+os, unicodedata, functools, csv, logging, shelve, time, requests, urllib3, pandas
 
 Uses the class YahooFantasySportsQuery from the yfpy_query file
 """
@@ -13,11 +13,69 @@ __email__ = "lipefraga@gmail.com"
 
 import os
 import unicodedata
+import functools
 import csv
 import logging
+import shelve
+import time
+import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from yfpy_query import YahooFantasySportsQuery
 
 
+# Latin-1 and Latin Extended-A letters mapped to their ascii letters, built once when the module is imported
+ascii_fold_table = {code: unicodedata.normalize("NFD", chr(code)).encode("ascii", "ignore").decode("ascii") for code in range(0x80, 0x180)}
+
+
+@functools.lru_cache(maxsize=None)
+def ascii_fold(text):
+    """Removes the accents and any other non-ascii character from a name.
+    The common accented letters are replaced with ascii_fold_table, and only names with other characters are normalized.
+    The results are cached, so names seen by an earlier SetUp object are not normalized again.
+
+    Parameters
+    ----------
+    text : str
+        the name that will be folded into ascii
+
+    Returns
+    ----------
+    folded_text : str
+        the name written only with ascii characters
+    """
+    text = text.translate(ascii_fold_table)
+    if text.isascii():
+        return text
+    return unicodedata.normalize("NFD", text).encode("ascii", "ignore").decode("utf-8")
+
+
+@functools.lru_cache(maxsize=256)
+def stat_type(display_name, sort_order):
+    """Returns the stat category type label for a stat category's name and sort order.
+    The results are cached, so the same stat categories of later SetUp objects are not scanned again.
+
+    Parameters
+    ----------
+    display_name : str
+        the name of the stat category, as displayed by Yahoo Fantasy
+    sort_order : str
+        '1' when higher values are better for the stat category, '0' when lower values are better
+
+    Returns
+    ----------
+    stat_label : str
+        The string identifying the stat type for futher manipulations
+    """
+    if "/" in display_name:
+        return "fraction"
+    elif sort_order == '0':
+        return "inverse"
+    elif "%" in display_name:
+        return "percentage"
+    return "standard"
+
+
 class SetUp():
     """A class used to extract the necessary information to initialize the other classes.
 
@@ -40,6 +98,12 @@ class SetUp():
         the identifier for the combination of the Yahoo Fantasy league and the sport it belongs to
     yahoo_query : YahooFantasySportsQuery
         a query object used to extract data from the Yahoo Fantasy API
+    http_adapter : HTTPAdapter
+        the connection pool, with retries and back-off, shared by every query sent through yahoo_query
+    cache_dir : str
+        the path pointing to the file where the responses of the setup queries are cached, one file for each league
+    cache_ttl : int
+        the number of seconds the cached responses are kept, ignored when the FIS_USE_CACHE environment variable is set to 1
     league_info : YahooFantasyObject
         the extracted data for the league information
     league_name : str
@@ -59,9 +123,9 @@ class SetUp():
     stat_count : int
         the number of stats extracted for the Fantasy League
     stats_list : Array
-        a list of the extracted stats for the Fantasy League, contains stat name and stat type
+        a list of the extracted stats for the Fantasy League, contains a (stat name, stat type) tuple for each stat
     scoring_stats_list : Array
-        the list of the stats which are considered for the Fantasy League's scoring system, contains stat name and stat type
+        the list of the stats which are considered for the Fantasy League's scoring system, contains a (stat name, stat type) tuple for each stat
     league_teams_raw : YahooFantasyObject
         the extracted data for the league teams information
     teams_dict : dict
@@ -72,8 +136,10 @@ class SetUp():
         list of manager names for the Fantasy League
     weeks_raw : YahooFantasyObject
         the extracted data for the league weeks information
-    weeks : dict
-        dictionary with the game weeks as keys and start and end date to each week
+    weeks : pandas.core.frame.DataFrame
+        DataFrame indexed by the game weeks, with the start and end date of each week
+    weeks_dict : dict
+        dictionary with the game weeks as keys and start and end date to each week, built from weeks
     num_weeks : int
         number of weeks for the Fantasy League
 
@@ -82,6 +148,14 @@ class SetUp():
     -------
     __init__(game_id, game_code, season, league_id, show_log=False)
         initializes a SetUp object
+    configure_http_session()
+        mounts a pooled HTTP adapter with retries on the session used by yahoo_query
+    mount_http_adapter()
+        mounts http_adapter on the current session of yahoo_query, which is replaced when the token is refreshed
+    cached_query(method_name, *args)
+        runs one of the yahoo_query methods, or reads its response from the cache
+    invalidate_cache()
+        removes the cached responses of this league and season, so the next queries refresh them
     fill_in_league_dependent_info()
         fills in the information regarding league settings
     get_stat_type(stat_info)
@@ -90,6 +164,8 @@ class SetUp():
         fills in the information regarding league stats categories
     fill_in_week_info()
         fills in the information regarding league weeks
+    get_week_by_date(date)
+        returns the game week that contains a certain date
     """
 
     def __init__(self, game_id, game_code, season, league_id, show_log=False):
@@ -120,7 +196,10 @@ class SetUp():
         self.league_id = str(league_id)
         self.data_output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Data_Output\\")
         self.league_key = self.game_id + ".l." + self.league_id
+        self.cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Data_Output", self.league_key + "_setup_cache")
+        self.cache_ttl = 3600
         self.yahoo_query = YahooFantasySportsQuery(self.auth_dir, self.league_id, game_id=self.game_id, game_code=self.game_code, offline=False)
+        self.configure_http_session()
 
         if not show_log:
             logging.getLogger("yfpy_query").setLevel(level=logging.INFO)
@@ -139,6 +218,101 @@ class SetUp():
                 print("   ", stat[0])
         pass
 
+    def configure_http_session(self):
+        """Mounts a pooled HTTP adapter on the OAuth session used by yahoo_query.
+        The connections to the Yahoo Fantasy API are kept alive between queries, so the extraction threads do not repeat the TLS handshake,
+        and rate limited or failed requests are retried with exponential back-off.
+        yahoo_oauth replaces its session when it refreshes the token, so the adapter is mounted again after every refresh.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+        """
+        retries = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504, 999], allowed_methods=["GET"], raise_on_status=False)
+        self.http_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+        oauth = self.yahoo_query.oauth
+        refresh_access_token = oauth.refresh_access_token
+
+        def refresh_and_mount(*args, **kwargs):
+            refreshed = refresh_access_token(*args, **kwargs)
+            self.mount_http_adapter()
+            return refreshed
+
+        oauth.refresh_access_token = refresh_and_mount
+        self.mount_http_adapter()
+        pass
+
+    def mount_http_adapter(self):
+        """Mounts http_adapter on the current OAuth session of yahoo_query, unless it is already mounted there
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+        """
+        session = self.yahoo_query.oauth.session
+        if session.get_adapter("https://") is not self.http_adapter:
+            session.mount("https://", self.http_adapter)
+        pass
+
+    def cached_query(self, method_name, *args):
+        """Runs one of the yahoo_query methods, or reads its response from the cache.
+        The responses are cached on disk by league, season, method and arguments, and kept for cache_ttl seconds.
+        When the FIS_USE_CACHE environment variable is set to 1 the cached responses never expire, so the tests can run without the Yahoo Fantasy API,
+        and when it is set to 0 the cache is not used.
+
+        Parameters
+        ----------
+        method_name : str
+            the name of the yahoo_query method
+        *args
+            the arguments passed to the yahoo_query method
+
+        Returns
+        ----------
+        data : YahooFantasyObject
+            object containing the information requested by the query
+        """
+        use_cache = os.environ.get("FIS_USE_CACHE")
+        if use_cache == "0":
+            return getattr(self.yahoo_query, method_name)(*args)
+
+        key = "|".join([self.league_key, self.season, method_name, *map(str, args)])
+        with shelve.open(self.cache_dir) as cache:
+            cached = cache.get(key)
+        if cached is not None and (use_cache == "1" or time.time() < cached[0]):
+            return cached[1]
+
+        data = getattr(self.yahoo_query, method_name)(*args)
+        if data is not None:
+            with shelve.open(self.cache_dir) as cache:
+                cache[key] = (time.time() + self.cache_ttl, data)
+        return data
+
+    def invalidate_cache(self):
+        """Removes the cached responses of this league and season, so the next queries refresh them.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+        """
+        prefix = self.league_key + "|" + self.season + "|"
+        with shelve.open(self.cache_dir) as cache:
+            for key in [key for key in cache if key.startswith(prefix)]:
+                del cache[key]
+        pass
+
     def fill_in_league_settings_info(self):
         """Queries the information for the league information and settings. Fills in the relevant attributes.
 
@@ -150,7 +324,7 @@ class SetUp():
         -------
         None
         """
-        league_info = self.yahoo_query.get_league_info()
+        league_info = self.cached_query("get_league_info")
 
         self.league_info = league_info
         self.league_name = league_info.name #unicodedata.normalize("NFD", league_info.name).encode("ascii", "ignore").decode("utf-8")
@@ -166,13 +340,9 @@ class SetUp():
             self.current_week = self.last_week
 
         self.num_teams = league_info.num_teams
-        self.players_per_team = 0
-        self.IL_spots = 0
-        for i in range(len(league_info.settings.roster_positions)):
-            if league_info.settings.roster_positions[i]['roster_position'].position != "IL":
-                self.players_per_team += int(league_info.settings.roster_positions[i]['roster_position'].count)
-            else:
-                self.IL_spots += 1
+        roster_positions = [roster_position['roster_position'] for roster_position in league_info.settings.roster_positions]
+        self.players_per_team = sum(int(position.count) for position in roster_positions if position.position != "IL")
+        self.IL_spots = sum(1 for position in roster_positions if position.position == "IL")
 
         self.league_scoring_type = league_info.settings.scoring_type
 
@@ -180,20 +350,18 @@ class SetUp():
             self.stat_count = len(league_info.settings.stat_categories.stats)
             self.stats_list = []
             self.scoring_stats_list = []
-            for i in range(self.stat_count):
-                present_stat = ["stat_name", "stat_type"]
-                present_stat[0] = league_info.settings.stat_categories.stats[i]['stat'].display_name
-                present_stat[1] = self.get_stat_type(league_info.settings.stat_categories.stats[i]['stat'])
-                self.stats_list.append(present_stat)
-                if present_stat[1] != "fraction":
-                    self.scoring_stats_list.append(present_stat)
+            for stat in league_info.settings.stat_categories.stats:
+                stat_name_and_type = (stat['stat'].display_name, self.get_stat_type(stat['stat']))
+                self.stats_list.append(stat_name_and_type)
+                if stat_name_and_type[1] != "fraction":
+                    self.scoring_stats_list.append(stat_name_and_type)
         else:
             print("League type not supported")
 
         pass
 
     def get_stat_type(self, stat_info):
-        """Returns the stat category type label for a stat_category object.
+        """Returns the stat category type label for a stat_category object, using stat_type().
 
         Parameters
         ----------
@@ -206,13 +374,7 @@ class SetUp():
             The string identifying the stat type for futher manipulations
 
         """
-        if "/" in stat_info.display_name:
-            return "fraction"
-        elif stat_info.sort_order == '0':
-            return "inverse"
-        elif "%" in stat_info.display_name:
-            return "percentage"
-        return "standard"
+        return stat_type(stat_info.display_name, stat_info.sort_order)
 
     def fill_in_team_names_info(self):
         """Queries the information for the league teams. Fills in the relevant attributes.
@@ -225,16 +387,13 @@ class SetUp():
         ----------
         None
         """
-        league_teams = self.yahoo_query.get_league_teams()
+        league_teams = self.cached_query("get_league_teams")
         self.league_teams_raw = league_teams
         self.teams_dict = {}
         for team in league_teams:
-            self.teams_dict[team['team'].team_id] = [unicodedata.normalize("NFD", team['team'].name.decode('utf-8')).encode("ascii", "ignore").decode("utf-8"), unicodedata.normalize("NFD", team['team'].managers['manager'].nickname).encode("ascii", "ignore").decode("utf-8"), team['team'].team_logos['team_logo'].url]
-        self.teams_names = []
-        self.manager_names = []
-        for key in self.teams_dict.keys():
-            self.teams_names.append(self.teams_dict[key][0])
-            self.manager_names.append(self.teams_dict[key][1])
+            self.teams_dict[team['team'].team_id] = [ascii_fold(team['team'].name.decode('utf-8')), ascii_fold(team['team'].managers['manager'].nickname), team['team'].team_logos['team_logo'].url]
+        self.teams_names = [team_info[0] for team_info in self.teams_dict.values()]
+        self.manager_names = [team_info[1] for team_info in self.teams_dict.values()]
         pass
 
     def fill_in_weeks_info(self):
@@ -248,12 +407,41 @@ class SetUp():
         ----------
         None
         """
-        game_weeks = self.yahoo_query.get_game_weeks_by_game_id(self.game_id)
+        game_weeks = self.cached_query("get_game_weeks_by_game_id", self.game_id)
         self.weeks_raw = game_weeks
 
-        self.weeks = {}
-        self.num_weeks = 0
-        for week in game_weeks:
-            self.num_weeks = self.num_weeks + 1
-            self.weeks[week['game_week'].week] = [week['game_week'].start, week['game_week'].end]
+        game_weeks = [week['game_week'] for week in game_weeks]
+        self.weeks = pd.DataFrame({'start': pd.to_datetime([week.start for week in game_weeks]), 'end': pd.to_datetime([week.end for week in game_weeks])},
+                                  index=[week.week for week in game_weeks])
+        self.num_weeks = len(self.weeks)
         pass
+
+    @property
+    def weeks_dict(self):
+        """The league weeks in the dictionary shape, with the game weeks as keys and the start and end date of each week as strings.
+
+        Returns
+        ----------
+        weeks_dict : dict
+            dictionary with the game weeks as keys and start and end date to each week
+        """
+        return {week: [start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")] for week, start, end in zip(self.weeks.index, self.weeks['start'], self.weeks['end'])}
+
+    def get_week_by_date(self, date):
+        """Returns the game week that contains a certain date, searching the sorted start dates of the weeks.
+
+        Parameters
+        ----------
+        date : str
+            the date that will be searched, in a format understood by pandas.to_datetime
+
+        Returns
+        ----------
+        week : int
+            the game week containing the date, None if the date is not inside any week
+        """
+        date = pd.to_datetime(date)
+        position = self.weeks['start'].searchsorted(date, side='right') - 1
+        if position < 0 or date > self.weeks['end'].iloc[position]:
+            return None
+        return self.weeks.index[position]
@@ -1,7 +1,115 @@
+import sys
+import importlib.util
 from pathlib import Path
+from types import SimpleNamespace
 from loguru import logger
 import pytest
 
+from setup import SetUp
+from extraction import Extract_Week_Data, Extract_Players_Season_Data
+from organizer import Teams_Weekly_Data_Organizer, Players_Data_Organizer
+from visualizer import Visualize_Teams_Season_Data, Visualize_Teams_Week_Data
+from analyzer import Analyze_Players_Data
+
+
+# Example vars using public Yahoo league
+game_key = "402"
+game_code = "nba"
+season = "2020"
+league_id = "107914"
+
+
+# The objects below query the Yahoo Fantasy API, so they are only built when a test first needs them, and shared by the whole test session.
+# Set FIS_USE_CACHE=1 to reuse the cached SetUp queries instead of querying the API again.
+@pytest.fixture(scope="session")
+def setup():
+    # Initiate SetUp object using information for the test league
+    return SetUp(game_key, game_code, season, league_id, show_log=False)
+
+
+@pytest.fixture(scope="session")
+def week_extraction(setup):
+    # Initiate Extract_Week_Data object using setup object
+    return Extract_Week_Data(setup)
+
+
+@pytest.fixture(scope="session")
+def player_extraction(setup):
+    # Initiate Extract_Players_Season_Data object using setup object
+    player_extraction = Extract_Players_Season_Data(setup)
+    player_extraction.update_player_id_database()
+    player_extraction.extract_players_season_data(2017)
+    return player_extraction
+
+
+@pytest.fixture(scope="session")
+def weeks_data(setup, week_extraction):
+    # Initiate Teams_Weekly_Data_Organizer object using setup object, after the weeks were extracted
+    return Teams_Weekly_Data_Organizer(setup)
+
+
+@pytest.fixture(scope="session")
+def players_data(setup, player_extraction):
+    # Initiate Players_Data_Organizer object using setup object, after the players were extracted
+    return Players_Data_Organizer(setup)
+
+
+@pytest.fixture(scope="session")
+def visualizer_weeks(weeks_data):
+    # Initiate Visualize_Teams_Week_Data object and create the week table and score for week 1 (default week)
+    visualizer_weeks = Visualize_Teams_Week_Data(weeks_data)
+    visualizer_weeks.create_week_table()
+    visualizer_weeks.create_week_score()
+    return visualizer_weeks
+
+
+@pytest.fixture(scope="session")
+def visualizer_season(weeks_data):
+    # Initiate Visualize_Teams_Season_Data object and create the season table and score
+    visualizer_season = Visualize_Teams_Season_Data(weeks_data)
+    visualizer_season.create_season_table()
+    visualizer_season.create_season_score()
+    return visualizer_season
+
+
+@pytest.fixture(scope="session")
+def player_analysis(players_data):
+    # Initiate Analyze_Players_Data object and generate the analysis for 2019
+    player_analysis = Analyze_Players_Data(players_data)
+    player_analysis.generate_all_analysis(2019)
+    return player_analysis
+
+
+@pytest.fixture
+def weeks_setup():
+    # Initiate a SetUp object without querying the API, with three game weeks, the third one starting after a gap
+    game_weeks = [{"game_week": SimpleNamespace(week=week, start=start, end=end)}
+                  for week, start, end in [(1, "2020-12-22", "2020-12-27"), (2, "2020-12-28", "2021-01-03"), (3, "2021-01-11", "2021-01-17")]]
+    weeks_setup = SetUp.__new__(SetUp)
+    weeks_setup.game_id = game_key
+    weeks_setup.cached_query = lambda method_name, *args: game_weeks
+    weeks_setup.fill_in_weeks_info()
+    return weeks_setup
+
+
+@pytest.fixture(scope="session")
+def without_numba():
+    # Loads a separate copy of a FIS module while numba is hidden, so the NumPy fallbacks can be compared with the numba compiled kernels
+    def load_module(module_name):
+        numba = sys.modules.get("numba")
+        sys.modules["numba"] = None
+        try:
+            spec = importlib.util.spec_from_file_location(module_name + "_without_numba", Path(__file__).parent.parent / (module_name + ".py"))
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        finally:
+            if numba is None:
+                del sys.modules["numba"]
+            else:
+                sys.modules["numba"] = numba
+        return module
+    return load_module
+
 
 @pytest.fixture(autouse=True)
 def write_logs(request):
@@ -6,13 +6,10 @@ import os
 import warnings
 import json
 import pandas
+import numpy
+import pytest
 #import matplotlib
 
-from setup import SetUp
-from extraction import Extract_Week_Data, Extract_Players_Season_Data
-from organizer import Teams_Weekly_Data_Organizer, Players_Data_Organizer
-from visualizer import Visualize_Teams_Season_Data, Visualize_Teams_Week_Data
-from analyzer import Analyze_Players_Data
 
 import logging
 log = logging.getLogger(__name__)
@@ -34,17 +31,8 @@ auth_dir = "."
 # Example code will output data here
 data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_output")
 
-# Example vars using public Yahoo league
-game_key = "402"
-game_code = "nba"
-season = "2020"
-league_id = "107914"
 
-# Initiate SetUp object using information for the test league
-setup = SetUp(game_key, game_code, season, league_id, show_log=False)
-
-
-def test_setup_league_name():
+def test_setup_league_name(setup):
     """Test if SetUp class was initiated correctly with the information above.
     Check if league_name is 'NahasaCares'.
     """
@@ -52,7 +40,7 @@ def test_setup_league_name():
     assert setup.league_name == "NahasaCares"
 
 
-def test_setup_number_teams():
+def test_setup_number_teams(setup):
     """Test SetUp class to create a game using the information above.
     Check if number of teams is 8'.
     """
@@ -60,7 +48,7 @@ def test_setup_number_teams():
     assert setup.num_teams == 8
 
 
-def test_setup_league_type():
+def test_setup_league_type(setup):
     """Test SetUp class to create a game using the information above.
     Check if league scoring type is 'headone' and that there are 9 scoring stats.
     """
@@ -68,11 +56,7 @@ def test_setup_league_type():
     assert setup.league_scoring_type == "headone" and len(setup.scoring_stats_list) == 9
 
 
-# Initiate Extract_Week_Data object using setup object
-week_extraction = Extract_Week_Data(setup)
-
-
-def test_week_extraction_player_count():
+def test_week_extraction_player_count(week_extraction):
     """Test if Extract_Week_Data Class is correctly created.
     Check if extraction object has the correct attribute for players_per_team,
     if this attribute was assigned correctly, the other ones must have been too.
@@ -80,7 +64,7 @@ def test_week_extraction_player_count():
 
     assert week_extraction.players_per_team == 13
 
-def test_week_extraction_week_1():
+def test_week_extraction_week_1(week_extraction):
     """Test if Extract_Week_Data Class is created and executed correctly.
     Check if on week 1, team position 0 (first of 8: 0-7) has the value in stat position 9 (Steals) equals to 27,
     a very specific detail which will be True only if the data was extracted correctly
@@ -93,13 +77,8 @@ def test_week_extraction_week_1():
 
     assert raw_data['1'][0]['9'] == '27'
 
-#Initiate Extract_Players_Season_Data object using setup object
-player_extraction = Extract_Players_Season_Data(setup)
-player_extraction.update_player_id_database()
-player_extraction.extract_players_season_data(2017)
-
 
-def test_player_extraction_2017_season():
+def test_player_extraction_2017_season(player_extraction):
     """Test if Extract_Player_Data Class is created and executed correctly.
     Check if on week 1, team position 0 (first of 8: 0-7) has the value in stat position 9 (Steals) equals to 27,
     a very specific detail which will be True only if the data was extracted correctly
@@ -113,11 +92,7 @@ def test_player_extraction_2017_season():
     assert raw_data["5497"][6] == 48.0
 
 
-# Initiate Teams_Weekly_Data_Organizer object using setup object
-weeks_data = Teams_Weekly_Data_Organizer(setup)
-
-
-def test_week_organizer_current_week():
+def test_week_organizer_current_week(setup, weeks_data):
     """Test if Teams_Weekly_Data_Organizer Class is correctly created.
     Check if the current_week attribute is assigned the correct value, which must be equal to setup.current_week
     """
@@ -125,7 +100,7 @@ def test_week_organizer_current_week():
     assert weeks_data.current_week == int(setup.current_week)
 
 
-def test_week_organizer_data_output():
+def test_week_organizer_data_output(weeks_data):
     """Test if Teams_Weekly_Data_Organizer Class is correctly created and outputs DataFrame objects.
     Check if final_data and score_data attributes are of DataFrame type
     """
@@ -133,7 +108,7 @@ def test_week_organizer_data_output():
     assert type(weeks_data.final_data) == pandas.core.frame.DataFrame and type(weeks_data.score_data) == pandas.core.frame.DataFrame
 
 
-def test_week_organizer_week_1_data():
+def test_week_organizer_week_1_data(weeks_data):
     """Test if Teams_Weekly_Data_Organizer Class is correctly created and has the correct values.
     Check if the DataFrame for final_data has the correct values, using the same data point as test_extraction_week_1,
     See if the first row of the DataFrame (week 1, first team) for the stat category Steals ('ST') is equal to 27
@@ -142,11 +117,7 @@ def test_week_organizer_week_1_data():
     assert weeks_data.final_data.loc[0, 'ST'] == 27
 
 
-# Initiate Players_Data_Organizer object using setup object
-players_data = Players_Data_Organizer(setup)
-
-
-def test_player_organizer_2017_season_data():
+def test_player_organizer_2017_season_data(players_data):
     """Test if Players_Data_Organizer Class is correctly created.
     Check if the current_week attribute is assigned the correct value, which must be equal to setup.current_week
     """
@@ -154,15 +125,7 @@ def test_player_organizer_2017_season_data():
     assert players_data.X_dfs[2017].loc['5497', 6] == 48.0
 
 
-# Initiate Visualize_Teams_Week_Data object using setup object
-visualizer_weeks = Visualize_Teams_Week_Data(weeks_data)
-
-
-# Use Visualizer object to Create week table for week 1 (default week)
-visualizer_weeks.create_week_table()
-
-
-def test_visualizer_week_1_table():
+def test_visualizer_week_1_table(visualizer_weeks):
     """Test if Visualize_Teams_Week_Data Class is correctly created.
     Check if visualization for table_df is of the correct type, pandas.io.formats.style.Styler
     """
@@ -170,7 +133,7 @@ def test_visualizer_week_1_table():
     assert type(visualizer_weeks.display_week_table) == pandas.io.formats.style.Styler
 
 
-def test_visualizer_week_1_table_correctedness():
+def test_visualizer_week_1_table_correctedness(visualizer_weeks):
     """Test if Visualize_Teams_Week_Data Class is correctly created.
     Check if week_data DataFrame created for the generation of the pandas Styler object has the correct values, using the same data point as test_extraction_week_1,
     See if the first row (index = 0) of the Week 1 week_data is correct for the first team, i.e. the stat category Steals ('ST') is equal to 27
@@ -179,11 +142,7 @@ def test_visualizer_week_1_table_correctedness():
     assert visualizer_weeks.week_table_data.loc[0,'ST'] == 27
 
 
-# Use Visualizer object to Create week score
-visualizer_weeks.create_week_score()
-
-
-def test_visualizer_week_1_score():
+def test_visualizer_week_1_score(visualizer_weeks):
     """Test if Visualize_Teams_Week_Data Class is correctly created.
     Check if visualization for scoredf is of the correct type, pandas.io.formats.style.Styler
     """
@@ -191,7 +150,7 @@ def test_visualizer_week_1_score():
     assert type(visualizer_weeks.display_week_score) == pandas.io.formats.style.Styler
 
 
-def test_visualizer_week_1_score_correctedness():
+def test_visualizer_week_1_score_correctedness(visualizer_weeks):
     """Test if Visualize_Teams_Week_Data Class is correctly created.
     Check if week_data DataFrame created for the generation of the pandas Styler object has the correct values, using the same data point as test_extraction_week_1,
     See if the first row (index = 0) of the Week 1 week_data is correct for the first team, i.e. the score for the stat category Steals ('ST') is equal to 10
@@ -200,15 +159,7 @@ def test_visualizer_week_1_score_correctedness():
     assert visualizer_weeks.week_score_data.loc[0,'ST'] == 2.0
 
 
-# Initiate Visualize_Teams_Season_Data object using setup object
-visualizer_season = Visualize_Teams_Season_Data(weeks_data)
-
-
-# Use Visualizer object to Create season table
-visualizer_season.create_season_table()
-
-
-def test_visualizer_season_table():
+def test_visualizer_season_table(visualizer_season):
     """Test if Visualize_Teams_Season_Data Class is correctly created.
     Check if visualization for season_table is of the correct type, pandas.io.formats.style.Styler
     """
@@ -216,31 +167,280 @@ def test_visualizer_season_table():
     assert type(visualizer_season.season_table) == pandas.io.formats.style.Styler
 
 
-# Use Visualizer object to Create season score
-visualizer_season.create_season_score()
-
-
-def test_visualizer_season_score():
+def test_visualizer_season_score(visualizer_season):
     """Test if Visualize_Teams_Season_Data Class is correctly created.
     Check if visualization for season_score is of the correct type, matplotlib.axes._subplots.AxesSubplot
     """
 
     assert str(type(visualizer_season.season_score)) == "<class 'matplotlib.axes._subplots.AxesSubplot'>"
 
-# Initiate Analyze_Players_Data object using setup object
-player_analysis = Analyze_Players_Data(players_data)
-player_analysis.generate_all_analysis(2019)
 
-
-def test_analyzer_ranking_prediction():
+def test_analyzer_ranking_prediction(player_analysis):
     """Test if Analyze_Players_Data Class is correctly created.
     Check if the first player for the actual ranking is correct, i.e. James Harden
     """
     assert player_analysis.ranking_3.sort_values("Reality").iloc[0,0] == "James Harden"
 
-def test_analyzer_final_predictions():
+def test_analyzer_final_predictions(player_analysis):
     """Test if Analyze_Players_Data Class is correctly created.
     Check if visualization for final_predictions is of the correct type, pandas.io.formats.style.Styler
     """
     
     assert type(player_analysis.final_predictions) == pandas.io.formats.style.Styler
+
+
+
+@pytest.mark.parametrize("stats", [
+    numpy.array([[1.0, 2.0, 3.0, 4.0], [4.0, 3.0, 2.0, 1.0], [1.0, 1.0, 2.0, 2.0]]),
+    numpy.array([[0.456, 0.456, 0.5], [0.0, 0.0, 0.0], [3.0, 1.0, 3.0]]),
+    numpy.ones((3, 4)),
+    numpy.array([[5.0], [2.0]]),
+    numpy.empty((3, 0)),
+])
+def test_score_week_numba_matches_numpy(without_numba, stats):
+    """Test if the numba compiled score_week scores the week like the NumPy fallback.
+    Check the stat wins and matchup wins for ties, a week where every team ties, a single team and an empty week.
+    """
+    pytest.importorskip("numba")
+    import organizer
+    stat_wins, matchup_wins = organizer.score_week(stats)
+    expected_stat_wins, expected_matchup_wins = without_numba("organizer").score_week(stats)
+
+    assert numpy.array_equal(stat_wins, expected_stat_wins) and numpy.array_equal(matchup_wins, expected_matchup_wins)
+
+
+@pytest.mark.parametrize("stats", [
+    numpy.array([[10.0, 5.0, 0.5, 4.0, 3.0, 0.75, 2.0, 20.0, 8.0, 5.0, 1.0, 1.0, 3.0],
+                 [12.0, 4.0, 1 / 3, 5.0, 4.0, 0.8, 0.0, 9.0, 3.0, 2.0, 0.0, 2.0, 1.0]]),
+    numpy.array([[0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+                 [50.0, 23.0, 0.46, 50.0, 39.0, 0.78, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]]),
+    numpy.empty((0, 13)),
+])
+def test_score_players_numba_matches_numpy(without_numba, stats):
+    """Test if the numba compiled score_players scores the players like the NumPy fallback.
+    Check players without attempts, percentages exactly at the league averages and an empty season.
+    """
+    pytest.importorskip("numba")
+    import organizer
+    multipliers = numpy.array([1.5, 2.0, 1.0, 1.5, 1.2, 0.35, 0.6, 0.8, 1.6, 1.6, -0.9])
+
+    assert numpy.allclose(organizer.score_players(stats, multipliers), without_numba("organizer").score_players(stats, multipliers), rtol=1e-12, atol=0.0)
+
+
+@pytest.mark.parametrize("stats, means", [
+    (numpy.array([[0.45, 0.8, 120.0, 14.0], [0.5, 0.75, 100.0, 10.0]]), numpy.array([0.47, 0.77, 110.0, 12.0])),
+    (numpy.array([[0.45, 0.0, 120.0, 0.0], [0.5, 0.75, 0.0, 10.0]]), numpy.array([0.47, 0.0, 110.0, 12.0])),
+    (numpy.empty((0, 4)), numpy.array([0.47, 0.77, 110.0, 12.0])),
+])
+def test_normalize_stats_numba_matches_numpy(without_numba, stats, means):
+    """Test if the numba compiled normalize_stats normalizes the Stat Comparison like the NumPy fallback.
+    Check an inverse stat of 0, a season average of 0 and a comparison without teams.
+    """
+    pytest.importorskip("numba")
+    import visualizer
+    inverse = numpy.array([False, False, False, True])
+
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        normalized_stats = visualizer.normalize_stats(stats.copy(), means, inverse)
+        expected_stats = without_numba("visualizer").normalize_stats(stats.copy(), means, inverse)
+
+    assert numpy.array_equal(normalized_stats, expected_stats, equal_nan=True)
+
+
+def test_week_result_table_saves_int_wins():
+    """Test if Extract_Week_Data.build_week_result_table keeps the format of the saved weeks.
+    Check that wins and losses are the ints 1 and 0 and draws are 0.5, as they are written to the week's json.
+    """
+    from types import SimpleNamespace
+    from extraction import Extract_Week_Data
+
+    def matchup(first_team, second_team, winner, is_tied=0):
+        teams = [{"team": SimpleNamespace(team_id=first_team)}, {"team": SimpleNamespace(team_id=second_team)}]
+        return {"matchup": SimpleNamespace(teams=teams, is_tied=is_tied, winner_team_key=None if is_tied else "402.l.107914.t." + str(winner))}
+
+    week_extraction = Extract_Week_Data.__new__(Extract_Week_Data)
+    week_extraction.num_teams = 4
+    scoreboard = SimpleNamespace(matchups=[matchup(1, 2, 2), matchup(3, 4, None, is_tied=1)])
+    outcomes = week_extraction.build_week_result_table({"scoreboard": scoreboard})
+
+    assert json.dumps(outcomes[1:]) == "[0, 1, 0.5, 0.5]"
+
+
+@pytest.mark.parametrize("first_team_ids, second_team_ids, is_tied, winner_ids", [
+    ([1, 3], [2, 4], [0, 0], [2, 3]),
+    ([1, 3], [2, 4], [1, 1], [0, 0]),
+    ([], [], [], []),
+])
+def test_resolve_week_outcomes_numba_matches_numpy(without_numba, first_team_ids, second_team_ids, is_tied, winner_ids):
+    """Test if the numba compiled resolve_week_outcomes fills in the same results as the plain python fallback.
+    Check a week with winners, a week where every matchup is a draw and a week without matchups.
+    """
+    pytest.importorskip("numba")
+    import extraction
+    arrays = (numpy.array(first_team_ids, dtype=numpy.int16), numpy.array(second_team_ids, dtype=numpy.int16),
+              numpy.array(is_tied, dtype=numpy.int8), numpy.array(winner_ids, dtype=numpy.int16))
+    outcomes = numpy.zeros(5)
+    expected_outcomes = numpy.zeros(5)
+    extraction.resolve_week_outcomes(*arrays, outcomes)
+    without_numba("extraction").resolve_week_outcomes(*arrays, expected_outcomes)
+
+    assert numpy.array_equal(outcomes, expected_outcomes)
+
+
+def test_player_info_ranking_keeps_plain_columns():
+    """Test if Players_Data_Organizer.calculate_points keeps player_info as plain object columns, even though the season averages are categories.
+    Check that the ranking built by Analyze_Players_Data.analyse_predictions from player_info keeps those columns and ranks the players.
+    """
+    from organizer import Players_Data_Organizer
+    from analyzer import Analyze_Players_Data
+
+    players_data = Players_Data_Organizer.__new__(Players_Data_Organizer)
+    players_data.points_multiplier = {'FG%': (8, 9), 'FT%': (15, 10), '3PTM': 6, 'PTS': 0.8, 'REB': 1.8, 'AST': 3, 'ST': 13, 'BLK': 9, 'TO': -4}
+    players_data.points_stats = (9, 10, 11, 12, 13, 14, 16, 18, 21, 22, 23, 24, 25)
+    players_data.player_info = {2020: None}
+    players_data.points_breakdown = {2020: None}
+    avg_stats_df = pandas.DataFrame(numpy.ones((3, 26)), index=['1', '2', '3'])
+    avg_stats_df[[2, 3, 4, 5]] = [["Player A", "Team A", "TA", "PG"], ["Player B", "Team B", "TB", "C"], ["Player C", "Team A", "TA", "SF"]]
+    avg_stats_df[[2, 3, 4, 5]] = avg_stats_df[[2, 3, 4, 5]].astype("category")
+    players_data.calculate_points(avg_stats_df, 2020)
+
+    player_analysis = Analyze_Players_Data.__new__(Analyze_Players_Data)
+    player_analysis.model_names = ["forest", "lasso", "elastic", "ridge"]
+    ranking = players_data.player_info[2020].copy()
+    predictions = pandas.DataFrame([[30.0, 28.0, 31.0, 29.0], [10.0, 12.0, 11.0, 9.0], [20.0, 21.0, 19.0, 22.0]], columns=player_analysis.model_names)
+    player_analysis.analyse_predictions(predictions, ranking, pandas.Series([35.0, 8.0, 20.0], index=['1', '2', '3']), [])
+
+    assert (ranking[['Player', 'Position', 'Team']].dtypes == object).all() and ranking.sort_values("Reality").iloc[0, 0] == "Player A"
+
+
+def test_setup_weeks_dict_round_trip(weeks_setup):
+    """Test if SetUp.weeks_dict gives back the league weeks in their previous dictionary shape.
+    Check that each game week maps to its [start, end] date strings, as they are returned by the Yahoo Fantasy API.
+    """
+
+    assert weeks_setup.num_weeks == 3 and weeks_setup.weeks_dict == {1: ["2020-12-22", "2020-12-27"], 2: ["2020-12-28", "2021-01-03"], 3: ["2021-01-11", "2021-01-17"]}
+
+
+@pytest.mark.parametrize("date, week", [
+    ("2020-12-24", 1),
+    ("2020-12-22", 1),
+    ("2020-12-27", 1),
+    ("2020-12-28", 2),
+    ("2021-01-17", 3),
+    ("2020-12-21", None),
+    ("2021-01-05", None),
+    ("2021-01-18", None),
+])
+def test_setup_get_week_by_date(weeks_setup, date, week):
+    """Test if SetUp.get_week_by_date finds the game week of a date.
+    Check dates inside the weeks, on their first and last days, between two weeks, and before and after the season.
+    """
+    assert weeks_setup.get_week_by_date(date) == week
+
+
+@pytest.mark.parametrize("text, folded_text", [
+    ("Luka Dončić", "Luka Doncic"),
+    ("Nikola Vučević", "Nikola Vucevic"),
+    ("Ḿanager", "Manager"),
+    ("NahasaCares", "NahasaCares"),
+])
+def test_setup_ascii_fold(text, folded_text):
+    """Test if ascii_fold removes the accents from a name.
+    Check names with letters from ascii_fold_table, with letters outside of it and without accents.
+    """
+    from setup import ascii_fold
+
+    assert ascii_fold(text) == folded_text
+
+
+def test_setup_ascii_fold_table_matches_normalize():
+    """Test if ascii_fold_table folds every letter like the unicodedata normalization it replaces."""
+    import unicodedata
+    from setup import ascii_fold
+
+    letters = "".join(chr(code) for code in range(0x80, 0x180))
+
+    assert ascii_fold(letters) == unicodedata.normalize("NFD", letters).encode("ascii", "ignore").decode("utf-8")
+
+
+@pytest.mark.parametrize("display_name, sort_order, stat_label", [
+    ("FGM/A", "1", "fraction"),
+    ("TO", "0", "inverse"),
+    ("FG%", "1", "percentage"),
+    ("PTS", "1", "standard"),
+])
+def test_setup_stat_type(display_name, sort_order, stat_label):
+    """Test if SetUp.get_stat_type labels a stat category, and if the label is cached by stat_type.
+    Check that a second lookup of the same stat category returns the same label from the cache.
+    """
+    from types import SimpleNamespace
+    from setup import SetUp, stat_type
+
+    setup = SetUp.__new__(SetUp)
+    stat_info = SimpleNamespace(display_name=display_name, sort_order=sort_order)
+    first_label = setup.get_stat_type(stat_info)
+    hits = stat_type.cache_info().hits
+
+    assert first_label == stat_label and setup.get_stat_type(stat_info) == stat_label and stat_type.cache_info().hits == hits + 1
+
+
+def test_week_extraction_requeries_unfinished_weeks(tmp_path):
+    """Test if Extract_Week_Data only reuses the saved weeks that had ended when they were saved.
+    Check that a week saved while it was the current week is queried again by the next extraction, once it has ended,
+    and that the weeks that were already final are not queried again.
+    """
+    from types import SimpleNamespace
+    from extraction import Extract_Week_Data
+
+    def extract(current_week, stat_value, winner, queried_weeks):
+        def get_league_scoreboard(week):
+            teams = [{"team": SimpleNamespace(team_id=1)}, {"team": SimpleNamespace(team_id=2)}]
+            return {"scoreboard": SimpleNamespace(matchups=[{"matchup": SimpleNamespace(teams=teams, is_tied=0, winner_team_key="402.l.107914.t." + str(winner))}])}
+
+        def get_team_stats_by_week(team, week):
+            queried_weeks.add(week)
+            return {"team_stats": {"stats": [{"stat": SimpleNamespace(value=stat_value)}]}, "team_remaining_games": {"total": {"completed_games": 3}}}
+
+        week_extraction = Extract_Week_Data.__new__(Extract_Week_Data)
+        week_extraction.data_dir = str(tmp_path / "league_extraction")
+        week_extraction.season = "2020"
+        week_extraction.int_season = 2020
+        week_extraction.current_week = current_week
+        week_extraction.num_teams = 2
+        week_extraction.stat_count = 1
+        week_extraction.max_workers = 2
+        week_extraction.team_names = {1: "A", 2: "B"}
+        week_extraction.team_managers = {1: "Manager A", 2: "Manager B"}
+        week_extraction.today_weekday = lambda: 2
+        week_extraction.get_league_scoreboard = get_league_scoreboard
+        week_extraction.get_team_stats_by_week = get_team_stats_by_week
+        week_extraction.extract_week_data_headone()
+        return week_extraction
+
+    first_queried_weeks, second_queried_weeks = set(), set()
+    extract(2, "10", 1, first_queried_weeks)
+    week_extraction = extract(3, "30", 2, second_queried_weeks)
+    saved_weeks = week_extraction.load_json(week_extraction.data_dir_week)
+
+    assert first_queried_weeks == {1, 2} and second_queried_weeks == {2, 3}
+    assert [(team["Team"], team["1"], team["Win"]) for team in saved_weeks["2"]] == [("A", "30", 0), ("B", "30", 1)]
+    assert [(team["Team"], team["1"], team["Win"]) for team in saved_weeks["1"]] == [("A", "10", 1), ("B", "10", 0)]
+
+
+@pytest.mark.parametrize("preds, reality", [
+    (numpy.array([[30.0, 28.0, 31.0, 29.0], [10.0, 12.0, 11.0, 9.0], [20.0, 21.0, 19.0, 22.0]]), numpy.array([35.0, 8.0, 20.0])),
+    (numpy.array([[20.0, 20.0, 5.0], [20.0, 10.0, 5.0], [10.0, 20.0, 5.0], [20.0, 10.0, 5.0]]), numpy.array([7.0, 7.0, 3.0, 7.0])),
+    (numpy.array([[12.0], [15.0], [12.0]]), numpy.array([1.0, 2.0, 3.0])),
+    (numpy.empty((0, 4)), numpy.empty(0)),
+])
+def test_rank_predictions_numba_matches_numpy(without_numba, preds, reality):
+    """Test if the numba compiled rank_predictions ranks the predictions like the NumPy fallback.
+    Check tied predictions and points, a single model and a season without players.
+    """
+    pytest.importorskip("numba")
+    import analyzer
+    rankings = analyzer.rank_predictions(preds, reality)
+    expected_rankings = without_numba("analyzer").rank_predictions(preds, reality)
+
+    assert all(numpy.allclose(ranking, expected_ranking, rtol=1e-12, atol=0.0) and ranking.shape == expected_ranking.shape
+               for ranking, expected_ranking in zip(rankings, expected_rankings))
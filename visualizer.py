@@ -2,7 +2,11 @@
 Use this module to import the Visualize_Teams_Season_Data and Visualize_Teams_Week_Data classes.
 
 Please be sure that the following libraries installed in the python Source folder:
-abc, pandas, numpy, os, matplotlib, seaborn, dataframe_image, IPython, bokeh
+abc, pandas, numpy, os, sys, copy, contextlib, concurrent, matplotlib, seaborn, dataframe_image, IPython, bokeh
+
+Outside of a jupyter notebook the figures are drawn with matplotlib's Agg backend, since they are only saved.
+
+Optionally, install numba to compile the normalization of the Stat Comparison.
 """
 
 __author__ = "Felipe P A Fraga (fisfraga)"
@@ -12,13 +16,62 @@ from abc import ABC, abstractmethod
 import pandas as pd
 import numpy as np
 import os
+import sys
+import copy
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import matplotlib
+if "ipykernel" not in sys.modules and "MPLBACKEND" not in os.environ:
+    matplotlib.use("Agg")
+import matplotlib.pyplot as plt
 import seaborn as sns
 import dataframe_image as dfi
 from IPython.display import display
-from bokeh.io import show, save
+from bokeh.io import show
+from bokeh.embed import file_html
+from bokeh.resources import CDN
 from bokeh.plotting import figure
 from bokeh.models import ColumnDataSource, HoverTool
 from bokeh.transform import dodge
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def normalize_stats(stats, means, inverse):
+    """Divides the stats of each team by the season averages, inverting the stats where lower values are better.
+    Compiled with numba when it is installed.
+
+    Parameters
+    ----------
+    stats : numpy.ndarray
+        matrix with one row for each team and one column for each compared stat
+    means : numpy.ndarray
+        the season average of each compared stat
+    inverse : numpy.ndarray
+        boolean mask of the compared stats where lower values are better
+
+    Returns
+    ----------
+    normalized_stats : numpy.ndarray
+        the stats relative to the season averages, above 1 when better than the average
+    """
+    normalized_stats = stats / means
+    with np.errstate(divide='ignore'):
+        normalized_stats[:, inverse] = 1 / normalized_stats[:, inverse]
+    return normalized_stats
+
+
+if njit is not None:
+    @njit(cache=True, error_model='numpy')
+    def normalize_stats(stats, means, inverse):
+        normalized_stats = stats / means
+        for stat in range(normalized_stats.shape[1]):
+            if inverse[stat]:
+                for team in range(normalized_stats.shape[0]):
+                    normalized_stats[team, stat] = 1 / normalized_stats[team, stat]
+        return normalized_stats
 
 
 class Data_Visualization(ABC):
@@ -28,13 +81,15 @@ class Data_Visualization(ABC):
     Attributes
     ----------
     data : pandas.core.frame.DataFrame
-        the DataFrame containing the organized data for the Yahoo Fantasy League's results
+        the DataFrame containing the organized data for the Yahoo Fantasy League's results, shared with the Data_Organizer object and never modified
     teams_names : Array
         list of teams names for the Fantasy League
     stats_list : Array
         a list of the extracted stats for the Fantasy League
     scoring_stats_list : Array
         the list of the stats which are considered for the Fantasy League
+    stats_drop_list : Array
+        the made and attempted columns of the fraction stats
     valid_input : bool
         variable to indicate the presence of organized data
     visualization_option : Array
@@ -43,6 +98,8 @@ class Data_Visualization(ABC):
         integer indicating the active visualization selected
     save_dir : str
         path to the directory where the visualizations will be saved to
+    gradient_cmap : matplotlib.colors.Colormap
+        the colormap used for the background gradient of the tables
 
     Methods:
     ----------
@@ -50,7 +107,7 @@ class Data_Visualization(ABC):
         initializes a Data_Visualization object and checks if the Data_Organizer object used to initialize it contains the data
     save_visualization():
         abstract method that saves the active visualization to the save_dir
-    generate_all_visualizations():
+    generate_all_visualizations(batch=False):
         abstract method that will generates all the non-team-specific visualizations for the Data_Visualization object
     """
 
@@ -67,7 +124,7 @@ class Data_Visualization(ABC):
         None
         """
         try:
-            self.data = organized_data.final_data.copy()
+            self.data = organized_data.final_data
             self.teams_names = organized_data.teams_names
             self.stats_list = organized_data.stats_list
             self.scoring_stats_list = organized_data.scoring_stats_list
@@ -78,6 +135,7 @@ class Data_Visualization(ABC):
         else:
             self.visualization_options = []
             self.active_option = 0
+            self.gradient_cmap = plt.get_cmap('RdBu')
             self.save_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Visualizations_Output\\", organized_data.league_name)
             self.valid_input = True
             print("This class supports the following functionalities:")
@@ -97,12 +155,13 @@ class Data_Visualization(ABC):
         pass
     
     @abstractmethod
-    def generate_all_visualizations(self):
+    def generate_all_visualizations(self, batch=False):
         """Abstract method that will generates all the non-team-specific visualizations for the Data_Visualization object
 
         Parameters
         ----------
-        None
+        batch : bool, optional
+            when True, the visualizations are only saved, without being displayed
 
         Returns
         ----------
@@ -117,14 +176,24 @@ class Visualize_Teams_Season_Data(Data_Visualization):
 
     Attributes
     ----------
+    season_colors : Array
+        the color palette of the Season Cumulative Score, shared by every object of the class and built the first time it is needed
     score_data : DataFrame
-        the DataFrame containing the organized data for the Yahoo Fantasy League's score
+        the DataFrame containing the organized data for the Yahoo Fantasy League's score, shared with the Teams_Weekly_Data_Organizer object
     week : int
         the active week for generating visualizations
     season_table : pandas.io.formats.style.Styler
         styled panadas DataFrame containing the Season_Table visualization
     season_score : matplotlib.axes._subplots.AxesSubplot
         plot that contains the Season_Cumulative_Score visualization
+    season_table_drops : Array
+        the columns that are not summed for the Season Table
+    percentage_stats : Array
+        the percentage stats, which are recalculated from the season's made and attempted stats
+    percentage_made : Array
+        the made stat for each of the percentage_stats
+    percentage_attempted : Array
+        the attempted stat for each of the percentage_stats
 
     Methods
     ----------
@@ -132,14 +201,16 @@ class Visualize_Teams_Season_Data(Data_Visualization):
         initializes a Visualize_Teams_Season_Data object and checks if the Teams_Weekly_Data_Organizer object used to initialize it contains the data
     save_visualization(self):
         saves the active visualization into its save directory
-    generate_all_visualizations():
+    generate_all_visualizations(batch=False):
         generates all the non-team-specific visualizations visualizations for the Data_Visualization object
-    create_season_table():
+    create_season_table(batch=False):
         generates the Season Table visualization
-    create_season_score():
+    create_season_score(batch=False):
         genetates the Season Cumulative Score visualization
     """
 
+    season_colors = None
+
     def __init__(self, data):
         """Initializes a Visualize_Teams_Season_Data object and
         checks if the Teams_Weekly_Data_Organizer object used to initialize it contains the data
@@ -157,8 +228,12 @@ class Visualize_Teams_Season_Data(Data_Visualization):
         if self.valid_input is False:
             print("Visualizer was not created")
         else:
-            self.score_data = data.score_data.copy()
+            self.score_data = data.score_data
             self.week = data.current_week
+            self.season_table_drops = ['Team_id', 'Week', 'Week_Result', 'Year']
+            self.percentage_stats = [stat[0] for stat in self.scoring_stats_list if stat[1] == "percentage"]
+            self.percentage_made = [stat_name.split("%")[0] + "M" for stat_name in self.percentage_stats]
+            self.percentage_attempted = [stat_name.split("%")[0] + "A" for stat_name in self.percentage_stats]
             self.visualization_options = ["Season Table", "Season Cumulative Score"]
             print("1. Create and save all the visualizations below at once: use .generate_all_visualizations()")
             print("2. Create and save the Season Table visualization: use .create_season_table()")
@@ -184,28 +259,31 @@ class Visualize_Teams_Season_Data(Data_Visualization):
             fig = self.season_score.get_figure()
             fig.savefig(save_dir)
 
-    def generate_all_visualizations(self):
+    def generate_all_visualizations(self, batch=False):
         """Generates the Season Table and the Season Cumulative Score visualizations
 
         Parameters
         ----------
-        None
+        batch : bool, optional
+            when True, the visualizations are only saved, without being displayed
 
         Returns
         ----------
         None
         """
-        self.create_season_table()
-        self.create_season_score()
+        self.create_season_table(batch)
+        self.create_season_score(batch)
         pass
 
 
-    def create_season_table(self):
-        """Generates the Season Table visualization
+    def create_season_table(self, batch=False):
+        """Generates the Season Table visualization, summing the stats of each team with a single groupby.
+        The percentages of the season are all divided at once, and are 0 for a team without attempts
 
         Parameters
         ----------
-        None
+        batch : bool, optional
+            when True, the visualization is only saved, without being displayed
 
         Returns
         ----------
@@ -213,29 +291,31 @@ class Visualize_Teams_Season_Data(Data_Visualization):
         """
         print("Creating visualization... Season Table is being processed")
         self.active_option = 1
-        self.season_table = pd.pivot_table(self.data.drop(columns=['Team_id', 'Week', 'Week_Result', 'Year']), index=['Team'], aggfunc=np.sum)
+        self.season_table = self.data.drop(columns=self.season_table_drops).groupby('Team', observed=True).sum(numeric_only=True)
         season_table_filter = []
         for stat in self.scoring_stats_list:
             season_table_filter.append(stat[0])
         season_table_filter.extend(['GP', 'Score', 'Matchup_Wins', 'Win'])
         formatting_dict = {"Win": "{:.1f}", "Score": "{:.1f}", "Matchup_Wins": "{:.1f}"}
-        for stat in self.scoring_stats_list:
-            if stat[1] == "percentage":
-                numerator = stat[0].split("%")[0] + "M"
-                denominator = stat[0].split("%")[0] + "A"
-                self.season_table[stat[0]] = self.season_table[numerator].div(self.season_table[denominator])
-                formatting_dict[stat[0]] = "{:.3f}"
+        formatting_dict.update(dict.fromkeys(self.percentage_stats, "{:.3f}"))
+        made = self.season_table[self.percentage_made].to_numpy(dtype=np.float64)
+        attempted = self.season_table[self.percentage_attempted].to_numpy(dtype=np.float64)
+        self.season_table[self.percentage_stats] = np.divide(made, attempted, out=np.zeros_like(made), where=attempted != 0)
         self.season_table = self.season_table[season_table_filter]
         self.season_table.sort_values(by=['Matchup_Wins'], ascending=False, inplace=True)
-        self.season_table = self.season_table.style.format(formatting_dict).background_gradient(cmap='RdBu', axis=0)
+        self.season_table = self.season_table.style.format(formatting_dict).background_gradient(cmap=self.gradient_cmap, axis=0)
         self.save_visualization()
-        display(self.season_table)
+        if not batch:
+            display(self.season_table)
+
+    def create_season_score(self, batch=False):
+        """Generates the Season Cumulative Score visualization.
+        In batch mode the figure is closed once it is saved, so the figures do not pile up in memory
 
-    def create_season_score(self):
-        """Generates the Season Cumulative Score visualization
         Parameters
         ----------
-        None
+        batch : bool, optional
+            when True, the visualization is only saved, without being displayed
 
         Returns
         ----------
@@ -243,11 +323,16 @@ class Visualize_Teams_Season_Data(Data_Visualization):
         """
         print("Creating visualization... Season Cumulative Score is being processed")
         self.active_option = 2
-        color = sns.color_palette("Paired", 12)
+        if Visualize_Teams_Season_Data.season_colors is None:
+            Visualize_Teams_Season_Data.season_colors = sns.color_palette("Paired", 12)
+        color = Visualize_Teams_Season_Data.season_colors
         scores = self.data.pivot(index="Week", columns="Team", values="Score")
         self.season_score = scores.cumsum().plot.line(color=color, figsize=[18, 15])
         self.save_visualization()
-        display(self.season_score)
+        if batch:
+            plt.close(self.season_score.get_figure())
+        else:
+            display(self.season_score)
 
 
 class Visualize_Teams_Week_Data(Data_Visualization):
@@ -262,7 +347,7 @@ class Visualize_Teams_Week_Data(Data_Visualization):
     last_week : int
         the last week available for visualizations
     score_data : pandas.core.frame.DataFrame
-        the DataFrame containing the organized data for the Yahoo Fantasy League's score
+        the DataFrame containing the organized data for the Yahoo Fantasy League's score, shared with the Teams_Weekly_Data_Organizer object
     week_table_data : pandas.core.frame.DataFrame
         present week's data as a pandas DataFrame object
     display_week_table : pandas.io.formats.style.Styler
@@ -271,6 +356,30 @@ class Visualize_Teams_Week_Data(Data_Visualization):
         the present week's score as a pandas DataFrame object
     display_week_score : pandas.io.formats.style.Styler
         formatted present week's score as a pandas Styler object
+    week_groups : dict
+        dictionary with the weeks as keys and the rows of data for each week, without the made and attempted columns of the fraction stats,
+        split once so each visualization looks its week up
+    score_week_groups : dict
+        dictionary with the weeks as keys and the rows of score_data for each week
+    week_table_drops : Array
+        the columns that are not shown in the Week Table
+    week_table_formatting : dict
+        the number format of the Week Table columns
+    comparison_stats : Array
+        the stats that are compared in the Stat Comparison
+    comparison_inverse : numpy.ndarray
+        boolean mask of the comparison_stats where lower values are better
+    comparison_means : numpy.ndarray
+        the season averages of the comparison_stats, which every Stat Comparison is normalized by
+    comparison_figure : bokeh.plotting.figure
+        the Stat Comparison figure, built for the first matchup and reused for the next ones
+    comparison_source : ColumnDataSource
+        the data source of comparison_figure, replaced for each matchup
+    io_executor : ThreadPoolExecutor
+        the threads that write the Week Table and Week Score files while the next visualizations are created,
+        only open inside background_writes(), otherwise the files are written right away
+    io_futures : Array
+        the file writes that were submitted to io_executor and were not waited for yet
 
     Methods
     ----------
@@ -278,22 +387,34 @@ class Visualize_Teams_Week_Data(Data_Visualization):
         initializes a Visualize_Teams_Week_Data object and checks if the Teams_Weekly_Data_Organizer object used to initialize it contains the data
     save_visualization(self):
         saves the active visualization into its save directory
-    generate_all_visualizations():
+    write_file(write, styler, path):
+        writes a Styler to a file, in the background when inside background_writes()
+    background_writes():
+        context manager that writes the files in the background, and waits for them when it exits
+    flush():
+        waits until all the files written in the background are saved
+    generate_all_visualizations(batch=False):
         generates all the non-team-specific visualizations visualizations for the Data_Visualization object
     create_visualization():
         generates a new visualization with user input
-    print_last_week_visualizations():
+    generate_last_week_visualizations(team_id=None, batch=False):
         generates all the existing visualizations for the most recent copmleted week, including stat comparisons for a specific team
+    prompt_team():
+        asks the user for the team that will be the focus of the stat comparisons
+    build_matchup_comparisons(team_id, week=None, batch=True):
+        generates the stat comparisons of a team against every other team, without user input
     change_week(new_week):
         changes the active week to the desired week
-    create_week_table():
+    create_week_table(batch=False):
         generates the Week Table visualization
-    create_week_score():
+    create_week_score(batch=False):
         genetates the Week Score visualization
-    create_stats_comparison(team_id, opp_id):
+    create_stats_comparison(team_id, opp_id, save_html=True, batch=False):
         genetates the Stat Comparison visualization for a specific matchup (primary team and opponent)
-    separate_fraction(stat_name):
-        separates a stat name that represents 2 different pieces of information (Made and Attempted) into 2 diferent names
+    build_comparison_figure(stats):
+        builds the Stat Comparison figure, which is reused for every matchup
+    save_html(pages):
+        writes rendered Stat Comparison pages to their .html files
     """
 
     def __init__(self, data):
@@ -315,14 +436,27 @@ class Visualize_Teams_Week_Data(Data_Visualization):
         else:
             self.week = 1
             self.last_week = data.current_week
-            self.score_data = data.score_data.copy()
+            self.score_data = data.score_data
+            self.week_groups = dict(tuple(self.data.drop(columns=self.stats_drop_list).groupby('Week', sort=False)))
+            self.score_week_groups = dict(tuple(self.score_data.groupby('Week', sort=False)))
+            self.week_table_drops = ['Team_id', 'Year', 'Win']
+            self.week_table_formatting = {"Week_Result": "{:.1f}", "Score": "{:.1f}", "Matchup_Wins": "{:.1f}"}
+            self.week_table_formatting.update({stat[0]: "{:.3f}" for stat in self.scoring_stats_list if stat[1] == "percentage"})
+            self.comparison_stats = [stat[0] for stat in self.stats_list if stat[1] != "fraction"]
+            self.comparison_inverse = np.array([stat[1] == "inverse" for stat in self.stats_list if stat[1] != "fraction"], dtype=bool)
+            self.comparison_means = self.data[self.comparison_stats].mean().to_numpy(dtype=np.float64)
+            self.comparison_figure = None
+            self.comparison_source = None
+            self.io_executor = None
+            self.io_futures = []
             self.visualization_options = ["Week Table", "Week Score", "Stat Comparison"]
             print("1. Create and save all non-team-specific visualizations at once: use .generate_all_visualizations()")
             print("2. Create and print one visualization at a time: use .create_visualization()")
             print("3. Create and print the visualization for the last week: use .generate_last_week_visualizations()")
 
     def save_visualization(self):
-        """Saves the active visualization into its save directory
+        """Saves the active visualization into its save directory.
+        Inside background_writes() the file is written by io_executor.
 
         Parameters
         ----------
@@ -334,14 +468,38 @@ class Visualize_Teams_Week_Data(Data_Visualization):
         """
         if self.active_option == 1:
             save_dir = self.save_dir + "_week_" + str(self.week) + "_table.png"
-            dfi.export(self.display_week_table, save_dir)
+            self.write_file(dfi.export, self.display_week_table, save_dir)
         elif self.active_option == 2:
             save_dir = self.save_dir + "_week_" + str(self.week) + "_score.png"
-            dfi.export(self.display_week_score, save_dir)
+            self.write_file(dfi.export, self.display_week_score, save_dir)
         pass
 
-    def generate_all_visualizations(self):
-        """Generates the Week Table and the Week Score visualizations for every week
+    def write_file(self, write, styler, path):
+        """Writes a Styler to a file. Inside background_writes() the write is submitted to io_executor with a copy of the Styler,
+        since rendering a Styler changes its state and the original one is still displayed by the main thread.
+
+        Parameters
+        ----------
+        write : function
+            the function that writes the Styler, called as write(styler, path)
+        styler : pandas.io.formats.style.Styler
+            the formatted visualization
+        path : str
+            path to the file
+
+        Returns
+        ----------
+        None
+        """
+        if self.io_executor is None:
+            write(styler, path)
+        else:
+            self.io_futures.append(self.io_executor.submit(write, copy.deepcopy(styler), path))
+
+    @contextmanager
+    def background_writes(self):
+        """Opens io_executor, so the files of the visualizations created inside the with block are written in the background.
+        When the block exits, waits for all the files, raises any error that happened while writing them, and shuts io_executor down.
 
         Parameters
         ----------
@@ -351,29 +509,84 @@ class Visualize_Teams_Week_Data(Data_Visualization):
         ----------
         None
         """
-        for week in range(1, self.last_week + 1):
-            self.week = week
-            self.create_week_table()
-            self.create_week_score()
+        self.io_executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            yield
+            self.flush()
+        finally:
+            self.io_executor.shutdown(wait=True)
+            self.io_executor = None
+            self.io_futures = []
+
+    def flush(self):
+        """Waits until all the files written in the background are saved, raising any error that happened while writing them
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+        """
+        io_futures, self.io_futures = self.io_futures, []
+        for io_future in io_futures:
+            io_future.result()
+
+    def generate_all_visualizations(self, batch=False):
+        """Generates the Week Table and the Week Score visualizations for every week
+
+        Parameters
+        ----------
+        batch : bool, optional
+            when True, the visualizations are only saved, without being displayed
+
+        Returns
+        ----------
+        None
+        """
+        with self.background_writes():
+            for week in range(1, self.last_week + 1):
+                self.week = week
+                self.create_week_table(batch)
+                self.create_week_score(batch)
 
-    def generate_last_week_visualizations(self):
+    def generate_last_week_visualizations(self, team_id=None, batch=False):
         """Generates the Week Table and the Week Score visualizations for the last week,
         as well as the Stat Comparison visualization for a chosen team against all other teams.
 
         Parameters
         ----------
-        None
+        team_id : int, optional
+            the team identifier for the team of the Stat Comparisons, asked to the user when not given
+        batch : bool, optional
+            when True, the visualizations are only saved, without being displayed
 
         Returns
         ----------
         None
         """
         self.week = self.last_week - 1
-        self.create_week_table()
-        self.create_week_score()
+        self.create_week_table(batch)
+        self.create_week_score(batch)
 
-        invalid_input = True
-        while invalid_input:
+        if team_id is None:
+            team_id = self.prompt_team()
+        self.build_matchup_comparisons(team_id, batch=batch)
+
+    def prompt_team(self):
+        """Asks the user for the team that will be the focus of the Stat Comparisons, until a valid team number is typed
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        team_id : int
+            the team identifier chosen by the user
+        """
+        while True:
             print('Please type the number of the Team you would like to create the Visualizations for the last week:\nSelect a team from 1 to ', len(self.teams_names), ":")
             for i in range(len(self.teams_names)):
                 print(str(i+1), ": ", self.teams_names[i])
@@ -381,11 +594,31 @@ class Visualize_Teams_Week_Data(Data_Visualization):
             if int(team_id) not in range(1, len(self.teams_names) + 1):
                 print("Invalid input, please type a valid team number.")
                 continue
-            else:
-                invalid_input = False
-        for i in range(1, len(self.teams_names) + 1):
-            if i != team_id:
-                self.create_stats_comparison(team_id, i)
+            return team_id
+
+    def build_matchup_comparisons(self, team_id, week=None, batch=True):
+        """Generates the Stat Comparison visualizations of a team against every other team, without asking for any input,
+        and writes all of their pages at once. By default the plots are only written, without being shown.
+
+        Parameters
+        ----------
+        team_id : int
+            the team identifier for the team that will be the focus of the visualizations
+        week : int, optional
+            the week of the comparisons, the active week when not given
+        batch : bool, optional
+            when False, each plot is also shown
+
+        Returns
+        ----------
+        pages : Array
+            list with the (path to the .html file, rendered html) of each comparison
+        """
+        if week is not None:
+            self.change_week(week)
+        pages = [self.create_stats_comparison(team_id, i, save_html=False, batch=batch) for i in range(1, len(self.teams_names) + 1) if i != team_id]
+        self.save_html(pages)
+        return pages
 
     def create_visualization(self):
         """Generates a specific visualization from the list of possibilities for a chosen week, with user input
@@ -425,20 +658,7 @@ class Visualize_Teams_Week_Data(Data_Visualization):
         elif self.active_option == 2:
             self.create_week_score()
         elif self.active_option == 3:
-            invalid_input = True
-            while invalid_input:
-                print('Please type the number of the Team you would like to create the Visualizations for the last week:\nSelect a team from 1 to ', len(self.teams_names), ":")
-                for i in range(len(self.teams_names)):
-                    print(str(i+1), ": ", self.teams_names[i])
-                team_id = int(input())
-                if int(team_id) not in range(1, len(self.teams_names) + 1):
-                    print("Invalid input, please type a valid team number.")
-                    continue
-                else:
-                    invalid_input = False
-            for i in range(1, len(self.teams_names) + 1):
-                if i != team_id:
-                    self.create_stats_comparison(team_id, i)
+            self.build_matchup_comparisons(self.prompt_team(), batch=False)
 
 
     def change_week(self, new_week):
@@ -460,12 +680,13 @@ class Visualize_Teams_Week_Data(Data_Visualization):
         else:
             print("Invalid week number, please try again")
 
-    def create_week_table(self):
+    def create_week_table(self, batch=False):
         """Generates the Week Table visualization for the active week
 
         Parameters
         ----------
-        None
+        batch : bool, optional
+            when True, the visualization is only saved, without being displayed
 
         Returns
         ----------
@@ -473,27 +694,22 @@ class Visualize_Teams_Week_Data(Data_Visualization):
         """
         print("Creating visualization... Week ", self.week, " Table is being processed")
         self.active_option = 1
-        self.week_table_data = self.data[self.data['Week'] == self.week].drop(columns=["Week"])
-        week_table_drops = self.stats_drop_list
-        week_table_drops.extend(['Team_id', 'Year', 'Win'])
-        formatting_dict = {"Week_Result": "{:.1f}", "Score": "{:.1f}", "Matchup_Wins": "{:.1f}"}
-
-        for stat in self.scoring_stats_list:
-            if stat[1] == "percentage":
-                formatting_dict[stat[0]] = "{:.3f}"
-        self.week_table_data.drop(columns=week_table_drops, inplace=True) 
+        self.week_table_data = self.week_groups[self.week].drop(columns=["Week"])
+        self.week_table_data.drop(columns=self.week_table_drops, inplace=True) 
         self.week_table_data.sort_values(by=['Score'], ascending=False, inplace=True)
-        self.display_week_table = self.week_table_data.rename(columns={'Team':'Week'+str(self.week)}).style.format(formatting_dict).background_gradient(cmap='RdBu', axis=0).hide_index()
-        self.display_week_table.to_excel(self.save_dir + "_excel_week" + str(self.week) + ".xlsx")
+        self.display_week_table = self.week_table_data.rename(columns={'Team':'Week'+str(self.week)}).style.format(self.week_table_formatting).background_gradient(cmap=self.gradient_cmap, axis=0).hide_index()
+        self.write_file(lambda styler, path: styler.to_excel(path), self.display_week_table, self.save_dir + "_excel_week" + str(self.week) + ".xlsx")
         self.save_visualization()
-        display(self.display_week_table)
+        if not batch:
+            display(self.display_week_table)
 
-    def create_week_score(self):
+    def create_week_score(self, batch=False):
         """Generates the Week Score visualization for the active week
 
         Parameters
         ----------
-        None
+        batch : bool, optional
+            when True, the visualization is only saved, without being displayed
 
         Returns
         ----------
@@ -501,16 +717,18 @@ class Visualize_Teams_Week_Data(Data_Visualization):
         """
         print("Creating visualization... Week ", self.week, " Score Table is being processed")
         self.active_option = 2
-        self.week_score_data = self.score_data[self.score_data['Week']==self.week].drop(columns=["Week"])
+        self.week_score_data = self.score_week_groups[self.week].drop(columns=["Week"])
 
         self.week_score_data.drop(columns=['Team_id', 'Year', 'Manager'], inplace=True) 
         self.week_score_data.sort_values(by=['Score'], ascending=False, inplace=True)
-        self.display_week_score = self.week_score_data.style.format({"Week_Result": "{:.1f}"}).background_gradient(cmap='RdBu', axis=0).set_precision(1).hide_index()
+        self.display_week_score = self.week_score_data.style.format({"Week_Result": "{:.1f}"}).background_gradient(cmap=self.gradient_cmap, axis=0).set_precision(1).hide_index()
         self.save_visualization()
-        display(self.display_week_score)
+        if not batch:
+            display(self.display_week_score)
 
-    def create_stats_comparison(self, team_id, opp_id):
+    def create_stats_comparison(self, team_id, opp_id, save_html=True, batch=False):
         """Generates the Stat Comparison between 2 teams for the active week.
+        The plot is rendered to html once, and the page is returned so several comparisons can be written together.
 
         Parameters
         ----------
@@ -518,10 +736,15 @@ class Visualize_Teams_Week_Data(Data_Visualization):
             the team identifier for the team that will be the focus of the visualization
         opp_id : int
             the team identifier for the opponent
+        save_html : bool, optional
+            when True, the page is written to its .html file right away
+        batch : bool, optional
+            when True, the plot is only rendered to html, without being shown
 
         Returns
         ----------
-        None
+        page : tuple
+            the (path to the .html file, rendered html) of the visualization
         """
 
         print("Creating visualization... Week ", self.week, " Stat Comparison between", self.teams_names[team_id-1], "and", self.teams_names[opp_id-1], "is being processed")
@@ -529,98 +752,83 @@ class Visualize_Teams_Week_Data(Data_Visualization):
         title = "Stat Comparison - Week " + str(self.week) + " - Matchup: " + self.teams_names[team_id-1] + " vs " + self.teams_names[opp_id-1]
         filename = self.save_dir + "_week_" + str(self.week) + "_stat_comparison_" + str(team_id) + "_vs_" + str(opp_id)  + ".html"
 
-        self.week_data = self.data[self.data['Week'] == self.week].drop(columns=["Week"])
-        self.week_data.drop(columns=['Team_id', 'Manager', 'Year', 'Win'], inplace=True)
+        week_rows = self.week_groups[self.week]
+        self.week_data = week_rows.drop(columns=['Week', 'Team_id', 'Manager', 'Year', 'Win'])
 
-        stats = []
-        stats_round = {}
+        # Normalizes the week's stats by the season averages, inverting the stats where lower is better
+        stats = self.comparison_stats
+        week_stats = week_rows[stats].to_numpy(dtype=np.float64)
+        normalized_stats = normalize_stats(week_stats, self.comparison_means, self.comparison_inverse)
 
-        drop_list = ['Year', 'Manager', 'Score', 'Matchup_Wins', 'Week_Result', 'Win', 'GP']
-        for stat in self.stats_list:
+        normalized = pd.DataFrame(normalized_stats, index=week_rows['Team_id'], columns=stats)
+        real_stats = pd.DataFrame(week_stats, index=week_rows['Team_id'], columns=stats)
 
-            if stat[1] == "fraction":
-                numerator, denominator = self.separate_fraction(stat[0])
-                drop_list.append(numerator)
-                drop_list.append(denominator)
-            else:
-                stats.append(stat[0])
-            if stat[1] == "percentage":
-                stats_round[stat[0]] = 3
-            else:
-                stats_round[stat[0]] = 0
-
-        mean_stats = self.data.mean()[stats]
-        normalized_temp = self.data.drop(columns=drop_list).copy()
-
-        # Criar method para fazer normalizacao
-        normalized_temp["ones"]=1
-        norm = "_norm"
-
-        for stat in self.scoring_stats_list:
-            string = stat[0] + norm
-            if stat[1] == "inverse":
-                normalized_temp[string] = normalized_temp["ones"].div(normalized_temp[stat[0]].div(mean_stats[stat[0]]))
-                target = stat[0]
-            else:
-                normalized_temp[string] = normalized_temp[stat[0]].div(mean_stats[stat[0]])
-
-            normalized_temp.drop(columns=[stat[0]], inplace=True)
-
-        names = ['Team_id', 'Week', 'Team', 'ones'] + stats
-        normalized_temp.columns = names
-
-        normalized = normalized_temp[normalized_temp['Week'] == self.week].drop(columns=["Week"])
-        real_stats = normalized.copy()
-        normalized = normalized.drop(columns=['Team', 'ones']).set_index('Team_id').transpose()
-        real_stats[target] = real_stats['ones'].div(real_stats[target])
-        real_stats = real_stats.drop(columns=['Team', 'ones']).set_index('Team_id').mul(mean_stats)
-        real_stats = real_stats.transpose()
-
-        stats = normalized.index.tolist()
+        stats = normalized.columns.tolist()
 
         you = team_id
         opp = opp_id
 
-        color_list = []
-        for i in range(len(normalized[you].values.tolist())):
-            if normalized[you].values.tolist()[i] > normalized[opp].values.tolist()[i]:
-                color_list.append('00ab66')
-            else:
-                color_list.append('e03531')
+        normalized_you = normalized.loc[you].to_numpy()
+        normalized_opp = normalized.loc[opp].to_numpy()
+        color_list = np.where(normalized_you > normalized_opp, '00ab66', 'e03531').tolist()
 
         data = {'stats': stats,
-                'you': normalized[you].values.tolist(),
-                'opp': normalized[opp].values.tolist(),
+                'you': normalized_you.tolist(),
+                'opp': normalized_opp.tolist(),
                 'colors': color_list,
-                'real_you': real_stats[you].values.tolist(),
-                'real_opp': real_stats[opp].values.tolist()}
+                'real_you': real_stats.loc[you].to_numpy().tolist(),
+                'real_opp': real_stats.loc[opp].to_numpy().tolist()}
+
+        if self.comparison_figure is None:
+            self.comparison_figure, self.comparison_source = self.build_comparison_figure(stats)
+        p = self.comparison_figure
+        self.comparison_source.data = data
+        p.title.text = title
+        page = (filename, file_html(p, CDN, title))
+        if save_html:
+            self.save_html([page])
+        if not batch:
+            show(p)
+        return page
+
+    def build_comparison_figure(self, stats):
+        """Builds the Stat Comparison figure, which is reused for every matchup by replacing its data and title
+
+        Parameters
+        ----------
+        stats : Array
+            the names of the compared stats, used as the categories of the x axis
 
-        source = ColumnDataSource(data=data)
+        Returns
+        ----------
+        p : bokeh.plotting.figure
+            the Stat Comparison figure
+        source : ColumnDataSource
+            the data source of the figure's bars
+        """
+        source = ColumnDataSource(data={'stats': [], 'you': [], 'opp': [], 'colors': [], 'real_you': [], 'real_opp': []})
 
         hover = HoverTool(tooltips=[("Stat","@stats"),("You","@real_you"), ("Opponent","@real_opp")], mode="mouse")
 
-        p = figure(x_range=stats, y_range=(0, 2), plot_height=250, title=title, toolbar_location=None, tools=[hover])
+        p = figure(x_range=stats, y_range=(0, 2), plot_height=250, title="Stat Comparison", toolbar_location=None, tools=[hover])
         p.vbar(x=dodge('stats', -0.2, range=p.x_range), top='you', width=0.33, source=source, color='colors')
         p.vbar(x=dodge('stats',  0.2,  range=p.x_range), top='opp', width=0.33, source=source, color="#a9a9b3")
         p.x_range.range_padding = 0.1
         p.xgrid.grid_line_color = None
-        save(p, filename=filename)
-        show(p)
+        return p, source
 
-    def separate_fraction(self, stat_name):
-        """Mehod that separates a stat name that has a '/' which denotes a fraction,
-        which will be divided into 2 entries, one for numerator, one for the denominator.
+    def save_html(self, pages):
+        """Writes rendered Stat Comparison pages to their .html files, each one with a single buffered write
 
         Parameters
         ----------
-        stat_name : str
-            stat name for a fraction that will be divided into 'made' and 'attempted'
+        pages : Array
+            list of (path to the .html file, rendered html) pairs
 
         Returns
         ----------
-        numerator : str
-            stat name for 'made something'
-        denominator : str
-            stat name for 'attempts of something'
+        None
         """
-        return stat_name.split("/")[0], stat_name.split("/")[0][0:-len(stat_name.split("/")[1])] + stat_name.split("/")[1]
\ No newline at end of file
+        for filename, html in pages:
+            with open(filename, 'w', encoding='utf-8', buffering=1 << 16) as html_file:
+                html_file.write(html)